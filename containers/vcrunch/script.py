@@ -1,7 +1,11 @@
 #!/usr/bin/env python3
 
 import argparse
+import atexit
+import fnmatch
+import functools
 import hashlib
+import importlib
 import json
 import logging
 import mimetypes
@@ -11,21 +15,45 @@ import platform
 import re
 import shlex
 import shutil
+import signal
+import struct
 import subprocess
 import sys
+import threading
+import time
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
-from fractions import Fraction
+from operator import itemgetter
+from types import ModuleType
 from typing import Any, Dict, List, Optional, Sequence, Tuple, TypedDict, TypeVar, cast
 from xml.sax.saxutils import escape as xml_escape
 
 OUT_EXT = ".mkv"
 DEFAULT_SUFFIX = ""
 MANIFEST_NAME = ".job.json"
+MANIFEST_SAVE_EVERY = 64
+MANIFEST_FLUSH_INTERVAL = 0.5
+MANIFEST_LOG_SUFFIX = ".log"
+# Rewrite the snapshot once the append log outgrows it by this factor.
+MANIFEST_COMPACT_FACTOR = 8
+ASSET_COPY_WORKERS = 4
 MAX_SVT_KBPS = 100_000
 DEFAULT_TARGET_SIZE = "23.30G"
 DEFAULT_SAFETY_OVERHEAD = 0.012
 
 FFMPEG_INPUT_FLAGS = ["-fflags", "+genpts"]
+# Classification only needs stream types, header durations and container
+# tags, so cap how much ffprobe reads and decodes (defaults: 5 MB / 5 s).
+FFPROBE_PROBE_LIMITS = ["-probesize", "1000000", "-analyzeduration", "1000000"]
+# The fields classification, timecode and creation-date lookups read.
+FFPROBE_PROBE_ENTRIES = (
+    "stream=codec_type,duration"
+    ":stream_disposition=attached_pic"
+    ":stream_tags=timecode"
+    ":format=format_name"
+    ":format_tags=creation_time,com.apple.quicktime.creationdate,timecode"
+)
 FFMPEG_OUTPUT_FLAGS = [
     "-avoid_negative_ts",
     "make_zero",
@@ -36,6 +64,35 @@ FFMPEG_OUTPUT_FLAGS = [
 VERBOSE_LEVEL = 0
 
 
+def _optional_module(name: str) -> Optional[ModuleType]:
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+_orjson = _optional_module("orjson")
+
+
+def _json_dumps(obj: Any, *, indent: bool = True) -> bytes:
+    if _orjson is not None:
+        try:
+            option = _orjson.OPT_INDENT_2 if indent else 0
+            return cast(bytes, _orjson.dumps(obj, option=option))
+        except TypeError:
+            # orjson rejects non-str keys and out-of-range ints; json copes.
+            pass
+    if indent:
+        return json.dumps(obj, indent=2).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if _orjson is not None:
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
 class _StreamExportRequired(TypedDict):
     path: str
     stream: Dict[str, Any]
@@ -63,6 +120,7 @@ class DumpedStreams(TypedDict):
     metadata_path: Optional[pathlib.Path]
     container_tags: Dict[str, str]
     stream_infos: List[StreamInfo]
+    video_selection: Optional[Tuple[int, str]]
 
 
 class _PacketGroup(TypedDict, total=False):
@@ -312,6 +370,12 @@ def _pick_real_video_stream_index(src: str) -> Optional[Tuple[int, str]]:
     except subprocess.CalledProcessError:
         return None
     streams = cast(List[Dict[str, Any]], data.get("streams") or [])
+    return _select_real_video_stream(streams, src)
+
+
+def _select_real_video_stream(
+    streams: List[Dict[str, Any]], src: str
+) -> Optional[Tuple[int, str]]:
     best_index: Optional[int] = None
     best_spec: Optional[str] = None
     best_score = -1
@@ -395,7 +459,7 @@ def _collect_frame_timestamps_seconds(
         )
         return _collect_packet_timestamps_seconds(src, stream_index, stream_spec)
     frames = cast(List[Dict[str, Any]], data.get("frames") or [])
-    timestamps: List[float] = []
+    timestamps = array("d")
     for frame in frames:
         if cast(str, frame.get("media_type")) != "video":
             continue
@@ -413,13 +477,7 @@ def _collect_frame_timestamps_seconds(
             stream_spec,
         )
         return _collect_packet_timestamps_seconds(src, stream_index, stream_spec)
-    fixed: List[float] = []
-    last = float("-inf")
-    for ts in timestamps:
-        if ts < last:
-            ts = last
-        fixed.append(ts)
-        last = ts
+    fixed = _monotonic_timestamps(timestamps)
     logging.debug(
         "collected %d frame timestamps for %s stream %s (%s)",
         len(fixed),
@@ -430,6 +488,16 @@ def _collect_frame_timestamps_seconds(
     return fixed
 
 
+def _monotonic_timestamps(timestamps: "array[float]") -> List[float]:
+    last = float("-inf")
+    for i, ts in enumerate(timestamps):
+        if ts < last:
+            timestamps[i] = last
+        else:
+            last = ts
+    return timestamps.tolist()
+
+
 def _parse_time_value(raw: Any) -> Optional[float]:
     if raw is None:
         return None
@@ -443,8 +511,10 @@ def _parse_time_value(raw: Any) -> Optional[float]:
             return float(value)
         except ValueError:
             if "/" in value:
+                # runs once per packet; plain float division beats Fraction()
+                num, den = value.split("/", 1)
                 try:
-                    return float(Fraction(value))
+                    return float(num) / float(den)
                 except (ValueError, ZeroDivisionError):
                     return None
     return None
@@ -478,7 +548,7 @@ def _collect_packet_timestamps_seconds(
         )
         return None
     packets = cast(List[Dict[str, Any]], data.get("packets") or [])
-    timestamps: List[float] = []
+    timestamps = array("d")
     for packet in packets:
         value = _parse_time_value(packet.get("pts_time"))
         if value is None:
@@ -494,13 +564,7 @@ def _collect_packet_timestamps_seconds(
             stream_spec,
         )
         return []
-    fixed: List[float] = []
-    last = float("-inf")
-    for ts in timestamps:
-        if ts < last:
-            ts = last
-        fixed.append(ts)
-        last = ts
+    fixed = _monotonic_timestamps(timestamps)
     logging.debug(
         "collected %d packet timestamps for %s stream %s (%s)",
         len(fixed),
@@ -540,9 +604,9 @@ def _dump_streams_and_metadata(
     container_tags: Dict[str, str] = {}
     if metadata:
         meta_path = dest_dir / "legacy_metadata.json"
-        with open(meta_path, "w", encoding="utf-8") as fh:
-            json.dump(metadata, fh, indent=2)
-            fh.write("\n")
+        with open(meta_path, "wb") as fh:
+            fh.write(_json_dumps(metadata))
+            fh.write(b"\n")
         fmt_obj = metadata.get("format")
         if isinstance(fmt_obj, dict):
             raw_format_name = fmt_obj.get("format_name")
@@ -645,9 +709,9 @@ def _dump_streams_and_metadata(
             if timestamps is not None:
                 packets_path = sidecar.with_suffix(".timing.json")
                 try:
-                    with open(packets_path, "w", encoding="utf-8") as fh:
-                        json.dump({"packets": timestamps}, fh, indent=2)
-                        fh.write("\n")
+                    with open(packets_path, "wb") as fh:
+                        fh.write(_json_dumps({"packets": timestamps}))
+                        fh.write(b"\n")
                 except OSError as write_exc:
                     logging.warning(
                         "failed to write packet timestamps for stream %s: %s",
@@ -664,6 +728,7 @@ def _dump_streams_and_metadata(
         "metadata_path": meta_path,
         "container_tags": container_tags,
         "stream_infos": stream_infos,
+        "video_selection": _select_real_video_stream(streams, src),
     }
 
 
@@ -811,6 +876,25 @@ def _pick_packet_bounds(
     return start, start + duration
 
 
+# Every stream of a source is measured separately; they share one
+# format/streams probe.
+def _bitrate_meta_probe(source_path: str) -> dict[str, Any]:
+    return _cached_probe(
+        "bitrate-meta",
+        source_path,
+        [
+            "ffprobe",
+            "-v",
+            "error",
+            "-print_format",
+            "json",
+            "-show_format",
+            "-show_streams",
+            source_path,
+        ],
+    )
+
+
 def _compute_stream_bitrate(
     source_path: str, stream_spec: str, *, stream_index: Optional[int] = None
 ) -> Optional[StreamBitrateEstimate]:
@@ -819,18 +903,7 @@ def _compute_stream_bitrate(
     if shutil.which("ffprobe") is None:
         return None
     try:
-        meta = ffprobe_json(
-            [
-                "ffprobe",
-                "-v",
-                "error",
-                "-print_format",
-                "json",
-                "-show_format",
-                "-show_streams",
-                source_path,
-            ]
-        )
+        meta = _bitrate_meta_probe(source_path)
     except Exception as exc:  # pragma: no cover - defensive logging
         logging.debug(
             "ffprobe failed during bitrate meta probe for %s: %s", source_path, exc
@@ -1057,13 +1130,22 @@ def _estimate_other_stream_bytes(
     return int(estimate), debug_entry
 
 
+_MKV_ORDER = {"v": 0, "a": 1, "s": 2, "d": 3, "t": 4}
+
+_MkvTrack = Tuple[int, pathlib.Path, Dict[str, Any], str]
+
+
+def _mkv_track(path: pathlib.Path, stream: Dict[str, Any], stype: str) -> _MkvTrack:
+    return (_MKV_ORDER.get(stype, 9), path, stream, stype)
+
+
 def _mkvmerge_args(
-    streams: List[Tuple[pathlib.Path, Dict[str, Any], str]],
+    streams: List[_MkvTrack],
 ) -> Tuple[List[str], List[pathlib.Path]]:
-    order = {"v": 0, "a": 1, "s": 2, "d": 3, "t": 4}
     args: List[str] = []
     used: List[pathlib.Path] = []
-    for path, stream, stype in sorted(streams, key=lambda item: order.get(item[2], 9)):
+    # itemgetter keeps the sort in C and stable for tracks of the same type.
+    for _, path, stream, stype in sorted(streams, key=itemgetter(0)):
         if stype not in {"v", "a", "s"}:
             continue
         lang = _stream_language(stream)
@@ -1102,6 +1184,15 @@ def _packet_sidecar_path(
     return None
 
 
+def _staged_file_names(directory: pathlib.Path) -> set[str]:
+    # One directory listing instead of a stat per sidecar.
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except FileNotFoundError:
+        return set()
+
+
 def _guess_mime_type(path: pathlib.Path) -> str:
     mime, _ = mimetypes.guess_type(path.name)
     if mime:
@@ -1276,6 +1367,7 @@ class MediaPreset(TypedDict):
 class MediaProbeResult(TypedDict, total=False):
     is_video: bool
     duration: Optional[float]
+    creation_date: Optional[str]
     error: str
 
 
@@ -1283,6 +1375,7 @@ class ProbeCacheEntry(TypedDict, total=False):
     path: str
     is_video: bool
     duration: float
+    creation_date: Optional[str]
     error: str
 
 
@@ -1336,41 +1429,39 @@ def run(cmd: list[str]) -> None:
         raise SystemExit(p.returncode)
 
 
+# canonical names map to themselves and take precedence over aliases
+_MEDIA_LOOKUP: dict[str, str] = {
+    **_MEDIA_ALIASES,
+    **{name: name for name in MEDIA_PRESETS},
+}
+_MEDIA_KEY_STRIP = str.maketrans("", "", "_ -")
+
+
 def _normalize_media(s: Optional[str]) -> Optional[str]:
     if not s:
         return None
-    key = s.strip().lower().replace("_", "").replace(" ", "")
-    key = key.replace("gb", "").replace("gib", "").replace("-", "")
-    if key in MEDIA_PRESETS:
-        return key
-    return _MEDIA_ALIASES.get(key)
+    key = s.strip().lower().translate(_MEDIA_KEY_STRIP)
+    return _MEDIA_LOOKUP.get(key.replace("gb", "").replace("gib", ""))
+
+
+_SIZE_MULTIPLIERS = {"k": 1024, "m": 1024**2, "g": 1024**3, "t": 1024**4}
+_RATE_MULTIPLIERS = {"k": 1000, "m": 1_000_000}
 
 
 def parse_size(s: str) -> int:
-    s = s.strip().lower().replace("ib", "")
-    mult = 1
-    if s.endswith("k"):
-        mult = 1024
-        s = s[:-1]
-    elif s.endswith("m"):
-        mult = 1024**2
-        s = s[:-1]
-    elif s.endswith("g"):
-        mult = 1024**3
-        s = s[:-1]
-    elif s.endswith("t"):
-        mult = 1024**4
-        s = s[:-1]
-    return int(float(s) * mult)
+    s = s.strip().lower().removesuffix("ib").removesuffix("b")
+    mult = _SIZE_MULTIPLIERS.get(s[-1:])
+    if mult is None:
+        return int(float(s))
+    return int(float(s[:-1]) * mult)
 
 
 def kbps_to_bps(s: str) -> int:
     s = s.strip().lower()
-    if s.endswith("k"):
-        return int(float(s[:-1]) * 1000)
-    if s.endswith("m"):
-        return int(float(s[:-1]) * 1_000_000)
-    return int(float(s))
+    mult = _RATE_MULTIPLIERS.get(s[-1:])
+    if mult is None:
+        return int(float(s))
+    return int(float(s[:-1]) * mult)
 
 
 def ffprobe_json(cmd: Sequence[str]) -> dict[str, Any]:
@@ -1381,73 +1472,74 @@ def ffprobe_json(cmd: Sequence[str]) -> dict[str, Any]:
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
     )
-    stdout = proc.stdout.decode("utf-8", "replace")
-    if not stdout.strip():
+    if not proc.stdout.strip():
         return {}
-    return cast(dict[str, Any], json.loads(stdout))
+    try:
+        return cast(dict[str, Any], _json_loads(proc.stdout))
+    except ValueError:
+        # tags are not always valid UTF-8; retry on a lossy decode
+        return cast(dict[str, Any], json.loads(proc.stdout.decode("utf-8", "replace")))
 
 
-def find_start_timecode(path: str) -> str:
-    probes = [
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-of",
-            "json",
-            "-select_streams",
-            "d",
-            "-show_streams",
-            "-show_entries",
-            "stream=tags",
-            path,
-        ],
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-of",
-            "json",
-            "-show_format",
-            "-show_entries",
-            "format=tags",
-            path,
-        ],
-        [
-            "ffprobe",
-            "-v",
-            "error",
-            "-of",
-            "json",
-            "-select_streams",
-            "v:0",
-            "-show_streams",
-            "-show_entries",
-            "stream=tags",
-            path,
-        ],
+# ffprobe results by probe kind and file identity, so a hard-linked stage
+# copy or a second lookup on the same unchanged file reuses the first probe.
+# Callers share the cached dicts and must treat them as read-only.
+_probe_cache: dict[Tuple[str, int, int, int, int], dict[str, Any]] = {}
+
+
+def _cached_probe(kind: str, path: str, cmd: List[str]) -> dict[str, Any]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ffprobe_json(cmd)
+    identity = (kind, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    cached = _probe_cache.get(identity)
+    if cached is None:
+        cached = _probe_cache[identity] = ffprobe_json(cmd)
+    return cached
+
+
+def probe_full(path: str, threads: Optional[int] = None) -> dict[str, Any]:
+    # threads caps decoder threads when several probes run side by side
+    cmd = [
+        "ffprobe",
+        "-v",
+        "error",
+        *FFPROBE_PROBE_LIMITS,
+        *(["-threads", str(threads)] if threads else []),
+        "-print_format",
+        "json",
+        "-show_entries",
+        FFPROBE_PROBE_ENTRIES,
+        path,
     ]
-    for cmd in probes:
-        try:
-            data = ffprobe_json(cmd)
-        except Exception:
+    return _cached_probe("full", path, cmd)
+
+
+def _timecode_from_probe(data: dict[str, Any]) -> Optional[str]:
+    streams = [s for s in data.get("streams") or [] if isinstance(s, dict)]
+    fmt = data.get("format")
+    candidates: List[Any] = [s for s in streams if s.get("codec_type") == "data"]
+    candidates.append(fmt)
+    candidates += [s for s in streams if s.get("codec_type") == "video"][:1]
+    for section in candidates:
+        if not isinstance(section, dict):
             continue
-        streams = data.get("streams")
-        if isinstance(streams, list):
-            for stream in streams:
-                if not isinstance(stream, dict):
-                    continue
-                tags = stream.get("tags")
-                if isinstance(tags, dict) and tags.get("timecode"):
-                    return str(tags["timecode"])
-        fmt = data.get("format")
-        if isinstance(fmt, dict):
-            tags = fmt.get("tags")
-            if isinstance(tags, dict) and tags.get("timecode"):
-                return str(tags["timecode"])
-    return "00:00:00:00"
+        tags = section.get("tags")
+        if isinstance(tags, dict) and tags.get("timecode"):
+            return str(tags["timecode"])
+    return None
+
+
+def find_start_timecode(path: str) -> str:
+    try:
+        data = probe_full(path)
+    except Exception:
+        return "00:00:00:00"
+    return _timecode_from_probe(data) or "00:00:00:00"
 
 
+@functools.lru_cache(maxsize=4096)
 def _parse_creation_date(value: str) -> Optional[str]:
     s = value.strip()
     if not s:
@@ -1479,23 +1571,7 @@ def _parse_creation_date(value: str) -> Optional[str]:
     return None
 
 
-def get_container_creation_date(path: str) -> Optional[str]:
-    cmd = [
-        "ffprobe",
-        "-v",
-        "error",
-        "-print_format",
-        "json",
-        "-show_entries",
-        "format_tags=creation_time,com.apple.quicktime.creationdate",
-        path,
-    ]
-
-    try:
-        data = ffprobe_json(cmd)
-    except Exception:
-        return None
-
+def _creation_date_from_probe(data: dict[str, Any]) -> Optional[str]:
     fmt = data.get("format")
     if not isinstance(fmt, dict):
         return None
@@ -1514,25 +1590,217 @@ def get_container_creation_date(path: str) -> Optional[str]:
     return None
 
 
+_MP4_TOP_LEVEL_BOXES = {b"ftyp", b"moov", b"mdat", b"free", b"skip", b"wide", b"pnot"}
+_MP4_EPOCH_OFFSET = 2_082_844_800  # 1904-01-01 -> 1970-01-01
+_MKV_EPOCH_OFFSET = 978_307_200  # 1970-01-01 -> 2001-01-01
+_MKV_SCAN_BYTES = 65536
+
+
+def _format_unix_time(seconds: float) -> Optional[str]:
+    try:
+        dt = datetime.fromtimestamp(seconds, tz=timezone.utc)
+    except (OverflowError, OSError, ValueError):
+        return None
+    return dt.replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def _read_mp4_creation_time(fh: Any) -> Optional[str]:
+    # Walk top-level boxes (seeking over mdat) to moov, then read mvhd.
+    def next_box(end: Optional[int]) -> Optional[Tuple[bytes, int, int]]:
+        start = fh.tell()
+        if end is not None and start + 8 > end:
+            return None
+        header = fh.read(8)
+        if len(header) < 8:
+            return None
+        size, kind = struct.unpack(">I4s", header)
+        payload = start + 8
+        if size == 1:
+            large = fh.read(8)
+            if len(large) < 8:
+                return None
+            size = struct.unpack(">Q", large)[0]
+            payload += 8
+        elif size == 0:
+            size = (end if end is not None else os.fstat(fh.fileno()).st_size) - start
+        if size < payload - start:
+            return None
+        return kind, payload, start + size
+
+    first = True
+    while True:
+        box = next_box(None)
+        if box is None:
+            return None
+        kind, payload, box_end = box
+        if first and kind not in _MP4_TOP_LEVEL_BOXES:
+            return None
+        first = False
+        if kind == b"moov":
+            break
+        fh.seek(box_end)
+
+    while True:
+        child = next_box(box_end)
+        if child is None:
+            return None
+        kind, payload, child_end = child
+        if kind == b"mvhd":
+            break
+        fh.seek(child_end)
+
+    version = fh.read(4)[:1]
+    if version == b"\x01":
+        raw = fh.read(8)
+        if len(raw) < 8:
+            return None
+        created = int(struct.unpack(">Q", raw)[0])
+    else:
+        raw = fh.read(4)
+        if len(raw) < 4:
+            return None
+        created = int(struct.unpack(">I", raw)[0])
+    if not created:
+        return None
+    if created >= _MP4_EPOCH_OFFSET:
+        created -= _MP4_EPOCH_OFFSET
+    return _format_unix_time(created)
+
+
+def _read_ebml_vint(buf: bytes, pos: int, keep_marker: bool) -> Tuple[int, int]:
+    if pos >= len(buf):
+        raise ValueError("truncated EBML element")
+    first = buf[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(buf):
+        raise ValueError("invalid EBML vint")
+    value = first if keep_marker else first & (mask - 1)
+    start, stop = pos + 1, pos + length
+    for byte in buf[start:stop]:
+        value = (value << 8) | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        value = -1  # unknown size
+    return value, stop
+
+
+def _read_mkv_date_utc(fh: Any) -> Optional[str]:
+    buf = fh.read(_MKV_SCAN_BYTES)
+    if not buf.startswith(b"\x1a\x45\xdf\xa3"):
+        return None
+    try:
+        pos = 0
+        end = len(buf)
+        while pos < end:
+            elem_id, pos = _read_ebml_vint(buf, pos, keep_marker=True)
+            size, pos = _read_ebml_vint(buf, pos, keep_marker=False)
+            if elem_id == 0x18538067:  # Segment: descend
+                end = len(buf) if size < 0 else min(len(buf), pos + size)
+                continue
+            if elem_id == 0x1F43B675:  # Cluster: Info always precedes it
+                return None
+            if size < 0:
+                return None
+            if elem_id == 0x1549A966:  # Info
+                info_end = min(len(buf), pos + size)
+                while pos < info_end:
+                    child_id, pos = _read_ebml_vint(buf, pos, keep_marker=True)
+                    child_size, pos = _read_ebml_vint(buf, pos, keep_marker=False)
+                    if child_id == 0x4461 and 0 < child_size <= 8:
+                        raw_end = pos + child_size
+                        raw = buf[pos:raw_end]
+                        if len(raw) < child_size:
+                            return None
+                        date_ns = int.from_bytes(raw, "big", signed=True)
+                        return _format_unix_time(
+                            date_ns / 1_000_000_000 + _MKV_EPOCH_OFFSET
+                        )
+                    if child_size < 0:
+                        return None
+                    pos += child_size
+                return None
+            pos += size
+    except ValueError:
+        return None
+    return None
+
+
+def _read_container_creation_date(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as fh:
+            magic = fh.read(4)
+            fh.seek(0)
+            if magic == b"\x1a\x45\xdf\xa3":
+                return _read_mkv_date_utc(fh)
+            return _read_mp4_creation_time(fh)
+    except (OSError, struct.error):
+        return None
+
+
+def get_container_creation_date(path: str) -> Optional[str]:
+    parsed = _read_container_creation_date(path)
+    if parsed:
+        return parsed
+    try:
+        data = probe_full(path)
+    except Exception:
+        return None
+    return _creation_date_from_probe(data)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_fraction_str(value: str) -> Optional[float]:
+    s = value.strip()
+    if not s or s.lower() == "n/a":
+        return None
+    if "/" in s:
+        num, den = s.split("/", 1)
+        try:
+            return float(num) / float(den)
+        except (ValueError, ZeroDivisionError):
+            return None
+    try:
+        return float(s)
+    except ValueError:
+        return None
+
+
 def _parse_fraction(value: Any) -> Optional[float]:
     if value is None:
         return None
     if isinstance(value, (int, float)):
         return float(value)
     if isinstance(value, str):
-        s = value.strip()
-        if not s or s.lower() == "n/a":
-            return None
-        if "/" in s:
-            num, den = s.split("/", 1)
+        return _parse_fraction_str(value)
+    return None
+
+
+_TIMECODE_RE = re.compile(r"(\d+):(\d+):(\d+(?:\.\d*)?)")
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_duration_str(value: str) -> Optional[float]:
+    s = value.strip()
+    if not s or s.lower() in {"n/a", "nan"}:
+        return None
+    try:
+        return float(s)
+    except ValueError:
+        m = _TIMECODE_RE.fullmatch(s)
+        if m:
+            return int(m[1]) * 3600 + int(m[2]) * 60 + float(m[3])
+        if ":" in s:
+            parts = s.split(":")
             try:
-                return float(num) / float(den)
-            except (ValueError, ZeroDivisionError):
+                total = 0.0
+                for part in parts:
+                    total = total * 60 + float(part)
+                return total
+            except ValueError:
                 return None
-        try:
-            return float(s)
-        except ValueError:
-            return None
     return None
 
 
@@ -1542,37 +1810,46 @@ def _parse_duration_value(value: Any) -> Optional[float]:
     if isinstance(value, (int, float)):
         return float(value) if value >= 0 else None
     if isinstance(value, str):
-        s = value.strip()
-        if not s or s.lower() in {"n/a", "nan"}:
-            return None
+        # ffprobe almost always reports a plain decimal; skip the cache for it.
         try:
-            return float(s)
+            parsed = float(value)
         except ValueError:
-            if ":" in s:
-                parts = s.split(":")
-                try:
-                    total = 0.0
-                    for part in parts:
-                        total = total * 60 + float(part)
-                    return total
-                except ValueError:
-                    return None
+            return _parse_duration_str(value)
+        return None if parsed != parsed else parsed
     return None
 
 
-def probe_media_info(path: str) -> MediaProbeResult:
-    cmd = [
-        "ffprobe",
-        "-v",
-        "error",
-        "-print_format",
-        "json",
-        "-show_streams",
-        "-show_format",
-        path,
-    ]
+# Never video, so not worth an ffprobe spawn. GIF stays out: animated ones
+# probe as video.
+_NON_VIDEO_EXTS = frozenset(
+    {
+        ".txt",
+        ".srt",
+        ".vtt",
+        ".ass",
+        ".ssa",
+        ".sub",
+        ".idx",
+        ".nfo",
+        ".jpg",
+        ".jpeg",
+        ".png",
+        ".heic",
+        ".pdf",
+        ".md",
+        ".log",
+        ".cue",
+        ".xml",
+        ".json",
+    }
+)
+
+
+def probe_media_info(path: str, threads: Optional[int] = None) -> MediaProbeResult:
+    if os.path.splitext(path)[1].lower() in _NON_VIDEO_EXTS:
+        return {"is_video": False, "duration": None}
     try:
-        data = ffprobe_json(cmd)
+        data = probe_full(path, threads=threads)
     except subprocess.CalledProcessError as exc:
         err = (
             exc.stderr.decode("utf-8", "replace").strip()
@@ -1583,17 +1860,25 @@ def probe_media_info(path: str) -> MediaProbeResult:
         if err:
             failure["error"] = err
         return failure
+    return _media_info_from_probe(data)
+
+
+@functools.lru_cache(maxsize=256)
+def _is_image_container(format_name: str) -> bool:
+    for name in format_name.split(","):
+        name = name.strip()
+        if name.endswith("_pipe") or name.startswith("image2"):
+            return True
+    return False
 
+
+def _media_info_from_probe(data: dict[str, Any]) -> MediaProbeResult:
     fmt = data.get("format") or {}
-    fmt_names = {n.strip() for n in (fmt.get("format_name") or "").split(",")}
-    is_image_container = any(
-        n.endswith("_pipe") or n.startswith("image2") for n in fmt_names
-    )
-    if is_image_container:
+    if _is_image_container(fmt.get("format_name") or ""):
         return {"is_video": False, "duration": None}
 
-    has_video_stream = False
-    positive_stream_durations: list[float] = []
+    # only the first real video stream with a positive duration matters
+    duration: Optional[float] = None
     for stream in data.get("streams") or []:
         if not isinstance(stream, dict):
             continue
@@ -1604,14 +1889,16 @@ def probe_media_info(path: str) -> MediaProbeResult:
             and stream["disposition"].get("attached_pic") == 1
         ):
             continue
-        has_video_stream = True
         d = _parse_duration_value(stream.get("duration"))
         if d is not None and d > 0:
-            positive_stream_durations.append(d)
+            duration = d
+            break
 
-    has_video = has_video_stream and bool(positive_stream_durations)
-    duration = positive_stream_durations[0] if positive_stream_durations else None
-    return {"is_video": has_video, "duration": duration}
+    has_video = duration is not None
+    result: MediaProbeResult = {"is_video": has_video, "duration": duration}
+    if has_video:
+        result["creation_date"] = _creation_date_from_probe(data)
+    return result
 
 
 def ffprobe_duration(path: str) -> float:
@@ -1629,6 +1916,31 @@ def is_valid_media(path: str) -> bool:
         return False
 
 
+_EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+_MKV_SEGMENT_ID = b"\x18\x53\x80\x67"
+
+
+def _matroska_header_ok(path: str) -> bool:
+    # EBML header element followed by a Segment: a cheap screen that rejects
+    # empty, truncated or foreign files before paying for an ffprobe spawn.
+    try:
+        with open(path, "rb") as f:
+            head = f.read(4096)
+    except OSError:
+        return False
+    if not head.startswith(_EBML_MAGIC) or len(head) < 5:
+        return False
+    # the header's data size is a 1-8 byte EBML varint
+    width = 9 - head[4].bit_length()
+    size_end = 4 + width
+    if width > 8 or len(head) < size_end:
+        return False
+    size = int.from_bytes(head[4:size_end], "big") & ((1 << (7 * width)) - 1)
+    segment_at = size_end + size
+    segment_end = segment_at + 4
+    return head[segment_at:segment_end] == _MKV_SEGMENT_ID
+
+
 def has_video_stream(path: str) -> bool:
     info = probe_media_info(path)
     return bool(info.get("is_video"))
@@ -1642,8 +1954,54 @@ def _should_ignore_name(name: str) -> bool:
     return name.startswith("._")
 
 
+def _scan_files(root: str, files: List[str]) -> None:
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if _should_ignore_name(entry.name):
+                continue
+            try:
+                if entry.is_dir():
+                    # match os.walk: never descend into symlinked directories
+                    if not entry.is_symlink():
+                        _scan_files(entry.path, files)
+                elif entry.is_file():
+                    files.append(entry.path)
+            except OSError:
+                continue
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_path_glob(pattern: str) -> Tuple[bool, Tuple[re.Pattern[str], ...]]:
+    # PurePath.match semantics: one fnmatch per component, anchored at the
+    # right (or at both ends for an absolute pattern).
+    pure = pathlib.PurePath(pattern)
+    parts = pure.parts[1:] if pure.is_absolute() else pure.parts
+    return pure.is_absolute(), tuple(
+        re.compile(fnmatch.translate(part)) for part in parts
+    )
+
+
+def _path_glob_matches(pattern: str, path: str) -> bool:
+    absolute, part_res = _compile_path_glob(pattern)
+    if not part_res:
+        return False
+    components = path.split(os.sep)
+    if absolute:
+        if components[0] or len(components) != len(part_res) + 1:
+            return False
+    elif len(components) < len(part_res):
+        return False
+    start = len(components) - len(part_res)
+    tail = components[start:]
+    return all(part_re.match(comp) for part_re, comp in zip(part_res, tail))
+
+
 def collect_all_files(paths: List[str], pattern: Optional[str]) -> List[str]:
-    files = []
+    files: List[str] = []
     for p in paths:
         p = os.path.abspath(p)
         if os.path.isfile(p):
@@ -1651,17 +2009,17 @@ def collect_all_files(paths: List[str], pattern: Optional[str]) -> List[str]:
                 continue
             files.append(p)
         elif os.path.isdir(p):
-            for root, dirs, fn in os.walk(p):
-                dirs[:] = [d for d in dirs if not _should_ignore_name(d)]
-                for f in fn:
-                    if _should_ignore_name(f):
-                        continue
-                    fp = os.path.abspath(os.path.join(root, f))
-                    if os.path.isfile(fp):
-                        files.append(fp)
+            _scan_files(p, files)
     if pattern:
-        files = [p for p in files if pathlib.PurePath(p).match(pattern)]
-    return sorted(set(files))
+        files = [p for p in files if _path_glob_matches(pattern, p)]
+    files.sort()
+    unique: List[str] = []
+    prev: Optional[str] = None
+    for f in files:
+        if f != prev:
+            unique.append(f)
+            prev = f
+    return unique
 
 
 def read_paths_from(fpath: str) -> List[str]:
@@ -1681,41 +2039,209 @@ def now_utc_iso() -> str:
     return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
-def load_manifest(path: str) -> dict[str, Any]:
+def _normalize_manifest(m: dict[str, Any]) -> dict[str, Any]:
+    # Validate the shape once so hot paths can trust items/probes are dicts of dicts.
+    for section in ("items", "probes"):
+        entries = m.get(section)
+        if isinstance(entries, dict):
+            m[section] = {k: v for k, v in entries.items() if isinstance(v, dict)}
+        else:
+            m[section] = {}
+    return m
+
+
+def _load_manifest_snapshot(path: str) -> dict[str, Any]:
     if not os.path.exists(path):
         return {"version": 1, "updated": now_utc_iso(), "items": {}, "probes": {}}
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            m = cast(dict[str, Any], json.load(f))
-            if not isinstance(m.get("items"), dict):
-                m["items"] = {}
-            if not isinstance(m.get("probes"), dict):
-                m["probes"] = {}
-            return m
+        with open(path, "rb") as f:
+            m = _json_loads(f.read())
+        if not isinstance(m, dict):
+            raise ValueError("manifest is not an object")
+        return _normalize_manifest(m)
     except Exception:
         return {"version": 1, "updated": now_utc_iso(), "items": {}, "probes": {}}
 
 
+def _manifest_generation(m: dict[str, Any]) -> int:
+    generation = m.get("generation")
+    return generation if isinstance(generation, int) else 0
+
+
+def _replay_manifest_log(manifest: dict[str, Any], path: str) -> None:
+    try:
+        fh = open(path + MANIFEST_LOG_SUFFIX, "rb")
+    except FileNotFoundError:
+        return
+    generation = _manifest_generation(manifest)
+    with fh:
+        for line in fh:
+            try:
+                entry = _json_loads(line)
+            except ValueError:
+                # a torn final line from an interrupted append
+                continue
+            if not isinstance(entry, dict):
+                continue
+            # lines from before the snapshot was last rewritten are already in
+            # it, and may be older than what it holds
+            if _manifest_generation(entry) != generation:
+                continue
+            key = entry.get("key")
+            item = entry.get("item")
+            if isinstance(key, str) and isinstance(item, dict):
+                manifest["items"][key] = item
+            updated = entry.get("updated")
+            if isinstance(updated, str):
+                manifest["updated"] = updated
+
+
+def load_manifest(path: str) -> dict[str, Any]:
+    m = _load_manifest_snapshot(path)
+    _replay_manifest_log(m, path)
+    return m
+
+
 def save_manifest(manifest: dict[str, Any], path: str) -> None:
     manifest["updated"] = now_utc_iso()
+    # A new generation retires the current log even if unlinking it below
+    # never happens; the in-memory one only advances once the snapshot is in.
+    generation = _manifest_generation(manifest) + 1
     tmp = path + ".tmp"
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(manifest, f, indent=2)
-        f.write("\n")
+    with open(tmp, "wb") as f:
+        f.write(_json_dumps(dict(manifest, generation=generation)))
+        f.write(b"\n")
     os.replace(tmp, path)
+    manifest["generation"] = generation
+    # the snapshot now includes everything the append log recorded
+    _silent_unlink(path + MANIFEST_LOG_SUFFIX)
 
 
-def manifest_error_basenames(manifest: dict[str, Any]) -> List[str]:
-    names: List[str] = []
-    items = manifest.get("items")
-    if not isinstance(items, dict):
-        return names
-    for rec in items.values():
-        if not isinstance(rec, dict):
-            continue
-        if not rec.get("error"):
-            continue
-        name: Optional[str] = None
+def append_manifest_items(
+    manifest: dict[str, Any], path: str, keys: Sequence[str]
+) -> int:
+    manifest["updated"] = now_utc_iso()
+    generation = _manifest_generation(manifest)
+    payload = b"".join(
+        _json_dumps(
+            {
+                "key": key,
+                "item": manifest["items"][key],
+                "updated": manifest["updated"],
+                "generation": generation,
+            },
+            indent=False,
+        )
+        + b"\n"
+        for key in keys
+    )
+    with open(path + MANIFEST_LOG_SUFFIX, "ab") as f:
+        f.write(payload)
+    return len(payload)
+
+
+# Debounces manifest saves in the encode loop: a burst of status changes is
+# written at most once per interval, and callers flush before long operations.
+# Flushes append the changed items to a JSONL log next to the manifest and only
+# rewrite the full snapshot once that log has grown past the snapshot size.
+# Sizes are read at flush time since other callers also save the manifest.
+class ManifestWriter:
+    def __init__(
+        self,
+        manifest: dict[str, Any],
+        path: str,
+        interval: float = MANIFEST_FLUSH_INTERVAL,
+    ) -> None:
+        self.manifest = manifest
+        self.path = path
+        self.interval = interval
+        self._dirty: dict[str, None] = {}
+        self._last_flush = float("-inf")
+
+    @staticmethod
+    def _size(path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def mark_dirty(self, key: str) -> None:
+        self._dirty[key] = None
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self, compact: bool = False) -> None:
+        if not self._dirty and not compact:
+            return
+        log_bytes = self._size(self.path + MANIFEST_LOG_SUFFIX)
+        if not self._dirty and not log_bytes:
+            return
+        snapshot_bytes = self._size(self.path)
+        if (
+            compact
+            or not snapshot_bytes
+            or log_bytes > MANIFEST_COMPACT_FACTOR * snapshot_bytes
+        ):
+            save_manifest(self.manifest, self.path)
+        else:
+            append_manifest_items(self.manifest, self.path, list(self._dirty))
+        self._dirty.clear()
+        self._last_flush = time.monotonic()
+
+    def flush_at_exit(self) -> None:
+        try:
+            self.flush()
+        except OSError as exc:
+            logging.error("failed to save manifest %s: %s", self.path, exc)
+
+
+def _raise_system_exit(signum: int, _frame: Any) -> None:
+    # Turn SIGTERM into a normal exit so finally blocks and atexit hooks run.
+    raise SystemExit(128 + signum)
+
+
+# Children started from --jobs worker threads. A signal only interrupts the
+# main thread, and subprocess.run kills its child only when the exception
+# unwinds the thread that called it, so the main thread terminates these
+# itself before waiting on the pool.
+class _ChildProcesses:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._running: set[subprocess.Popen[bytes]] = set()
+        self._stopping = False
+
+    def run(self, cmd: List[str], **kwargs: Any) -> subprocess.CompletedProcess[bytes]:
+        with self._lock:
+            if self._stopping:
+                return subprocess.CompletedProcess(cmd, -signal.SIGTERM)
+            proc = subprocess.Popen(cmd, **kwargs)
+            self._running.add(proc)
+        try:
+            returncode = proc.wait()
+        finally:
+            with self._lock:
+                self._running.discard(proc)
+        return subprocess.CompletedProcess(cmd, returncode)
+
+    def terminate_all(self) -> None:
+        with self._lock:
+            self._stopping = True
+            running = list(self._running)
+        for proc in running:
+            proc.terminate()
+
+
+def manifest_error_basenames(manifest: dict[str, Any]) -> List[str]:
+    names: List[str] = []
+    items = manifest.get("items")
+    if not isinstance(items, dict):
+        return names
+    for rec in items.values():
+        if not isinstance(rec, dict):
+            continue
+        if not rec.get("error"):
+            continue
+        name: Optional[str] = None
         src = rec.get("src")
         if isinstance(src, str) and src:
             name = os.path.basename(src)
@@ -1732,6 +2258,24 @@ def src_key(src_abs: str, st: os.stat_result) -> str:
     return f"{src_abs}|{st.st_size}|{int(st.st_mtime)}"
 
 
+def _output_stamp(st: os.stat_result) -> List[int]:
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _done_output_valid(rec: dict[str, Any], path: str) -> bool:
+    # An output still carrying the size/mtime recorded when it was published
+    # is the file that was validated then; only re-probe ones that changed.
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    if rec.get("validated") == _output_stamp(st):
+        return True
+    if path.lower().endswith(OUT_EXT) and not _matroska_header_ok(path):
+        return False
+    return is_valid_media(path)
+
+
 def all_videos_done(manifest: dict[str, Any], out_dir: str) -> bool:
     saw_video = False
     for rec in manifest.get("items", {}).values():
@@ -1742,15 +2286,139 @@ def all_videos_done(manifest: dict[str, Any], out_dir: str) -> bool:
         if not out_name:
             return False
         fp = os.path.join(out_dir, out_name)
-        if not (
-            rec.get("status") == "done" and os.path.exists(fp) and is_valid_media(fp)
-        ):
+        if not (rec.get("status") == "done" and _done_output_valid(rec, fp)):
             return False
     return saw_video
 
 
+def _silent_unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _makedirs_once(path: str, made: set[str]) -> None:
+    # makedirs(exist_ok=True) still stats every level; skip directories this
+    # run has already created or seen.
+    if path and path not in made:
+        os.makedirs(path, exist_ok=True)
+        made.add(path)
+
+
 def _short_hash(s: str) -> str:
-    return hashlib.sha1(s.encode("utf-8")).hexdigest()[:8]
+    return hashlib.blake2b(s.encode("utf-8"), digest_size=4).hexdigest()
+
+
+_COPY_CHUNK = 1 << 30
+# Linux FICLONE ioctl: share the source extents (reflink) on btrfs/XFS/bcachefs.
+_FICLONE = 0x40049409
+_fcntl = _optional_module("fcntl")
+
+
+def _copy_fd_contents(in_fd: int, out_fd: int) -> bool:
+    # Try the in-kernel primitives in order; returns False if neither applies
+    # (nothing has been written yet in that case). A primitive that reports
+    # EOF before copying anything is treated as unsupported: procfs, sysfs and
+    # some FUSE or network mounts return 0 instead of an errno.
+    if _fcntl is not None:
+        try:
+            _fcntl.ioctl(out_fd, _FICLONE, in_fd)
+            return True
+        except OSError as exc:
+            logging.debug("FICLONE unavailable, falling back: %s", exc)
+    copy_file_range = getattr(os, "copy_file_range", None)
+    for name, step in (
+        ("copy_file_range", copy_file_range),
+        ("sendfile", lambda i, o, n: os.sendfile(o, i, None, n)),
+    ):
+        if step is None:
+            continue
+        copied = 0
+        try:
+            while True:
+                sent = step(in_fd, out_fd, _COPY_CHUNK)
+                if sent == 0:
+                    if copied:
+                        return True
+                    break
+                copied += sent
+        except OSError as exc:
+            if copied:
+                raise
+            logging.debug("%s unavailable, falling back: %s", name, exc)
+    return False
+
+
+def _fadvise(fd: int, advice: str) -> None:
+    fadvise = getattr(os, "posix_fadvise", None)
+    if fadvise is None:
+        return
+    try:
+        fadvise(fd, 0, 0, getattr(os, advice))
+    except OSError as exc:
+        logging.debug("posix_fadvise(%s) failed: %s", advice, exc)
+
+
+def _drop_page_cache(path: str) -> None:
+    # Large media we are done reading should not evict more useful pages.
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        _fadvise(fd, "POSIX_FADV_DONTNEED")
+    finally:
+        os.close(fd)
+
+
+def _fast_copy(src: str, dst: str, *, copy_stat: bool = True) -> None:
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        _fadvise(fsrc.fileno(), "POSIX_FADV_SEQUENTIAL")
+        if not _copy_fd_contents(fsrc.fileno(), fdst.fileno()):
+            shutil.copyfileobj(fsrc, fdst)
+    if copy_stat:
+        shutil.copystat(src, dst)
+
+
+def _stage_source(src: str, stage_src: str) -> None:
+    _silent_unlink(stage_src)
+    # the stage is only ever read, so on the same filesystem a hard link will do
+    try:
+        os.link(src, stage_src)
+        return
+    except OSError as exc:
+        logging.debug("hard link %s -> %s failed, copying: %s", src, stage_src, exc)
+    # staged copies are scratch inputs; their timestamps and mode never matter
+    _fast_copy(src, stage_src, copy_stat=False)
+    _drop_page_cache(src)
+
+
+def _rename_into_place(src: str, dst: str) -> bool:
+    # A rename publishes atomically and moves no data, but only within one
+    # filesystem; False tells the caller to copy instead.
+    try:
+        os.replace(src, dst)
+    except OSError as exc:
+        logging.debug("rename %s -> %s failed, copying: %s", src, dst, exc)
+        return False
+    return True
+
+
+_AssetCopy = Tuple[str, str, str, Optional[str], Optional[os.stat_result]]
+
+
+def _copy_asset_file(job: _AssetCopy) -> Optional[Exception]:
+    src, dest, _, _, src_stat = job
+    try:
+        # copystat already carries atime/mtime over; only birth time is left
+        _fast_copy(src, dest)
+        birthtime = getattr(src_stat or os.stat(src), "st_birthtime", None)
+        if birthtime is not None:
+            _apply_birthtime(dest, birthtime)
+    except Exception as exc:
+        return exc
+    return None
 
 
 def copy_assets(
@@ -1759,148 +2427,172 @@ def copy_assets(
     rename_map: Optional[dict[str, str]] = None,
     manifest: Optional[dict[str, Any]] = None,
     manifest_path: Optional[str] = None,
+    stat_cache: Optional[dict[str, os.stat_result]] = None,
+    src_keys: Optional[dict[str, str]] = None,
 ) -> list[tuple[str, str]]:
     copied: list[tuple[str, str]] = []
     rename_map = rename_map or {}
+    stat_cache = stat_cache or {}
+    src_keys = src_keys or {}
     manifest_dict = manifest if isinstance(manifest, dict) else None
     manifest_items = manifest_dict.get("items") if manifest_dict else None
+    unsaved = 0
+
+    def checkpoint(force: bool = False) -> None:
+        nonlocal unsaved
+        if not force:
+            unsaved += 1
+        if manifest_dict is None or not manifest_path or not unsaved:
+            return
+        if force or unsaved >= MANIFEST_SAVE_EVERY:
+            save_manifest(manifest_dict, manifest_path)
+            unsaved = 0
+
+    def finish_copy(job: _AssetCopy, error: Optional[Exception]) -> None:
+        src, dest, dest_name, key, _ = job
+        if error is None:
+            logging.info("copied asset: %s -> %s", src, dest)
+            copied.append((src, dest_name))
+        else:
+            logging.error("failed to copy asset %s -> %s: %s", src, dest, error)
+        if manifest_items is None or key is None or manifest_dict is None:
+            return
+        if error is None:
+            manifest_items[key] = {
+                "type": "asset",
+                "src": src,
+                "output": dest_name,
+                "status": "done",
+                "finished_at": now_utc_iso(),
+            }
+        else:
+            manifest_items[key] = {
+                "type": "asset",
+                "src": src,
+                "output": dest_name,
+                "status": "pending",
+                "error": str(error),
+            }
+        checkpoint()
 
-    for src in assets:
-        dest_name = rename_map.get(src, os.path.basename(src))
-        dest_name = os.path.normpath(dest_name)
-        dest_name = _lowercase_suffix_str(dest_name)
-        dest = os.path.join(out_dir, dest_name)
-        if os.path.abspath(src) == os.path.abspath(dest):
-            continue
-
-        key: Optional[str] = None
-        record: Optional[dict[str, Any]] = None
-        src_stat: Optional[os.stat_result] = None
-        if manifest_items is not None:
-            try:
-                st = os.stat(src)
-                src_stat = st
-            except FileNotFoundError:
-                logging.warning("asset missing, skipping: %s", src)
+    queued: List[_AssetCopy] = []
+    out_dir_abs = os.path.abspath(out_dir)
+    made_dirs: set[str] = set()
+    try:
+        for src in assets:
+            dest_name = rename_map.get(src, os.path.basename(src))
+            dest_name = _lowercase_suffix_str(os.path.normpath(dest_name))
+            dest = os.path.join(out_dir, dest_name)
+            src_abs = os.path.abspath(src)
+            if src_abs == os.path.normpath(os.path.join(out_dir_abs, dest_name)):
                 continue
-            key = src_key(os.path.abspath(src), st)
-            rec_val = manifest_items.get(key)
-            if isinstance(rec_val, dict):
-                record = rec_val
-
-            if record and record.get("status") == "done":
-                recorded_output = os.path.normpath(record.get("output") or dest_name)
-                output_path = os.path.join(out_dir, recorded_output)
-                if os.path.exists(output_path):
-                    if recorded_output != dest_name:
-                        new_output_path = os.path.join(out_dir, dest_name)
-                        new_output_dir = os.path.dirname(new_output_path)
-                        if new_output_dir and not os.path.exists(new_output_dir):
-                            os.makedirs(new_output_dir, exist_ok=True)
-                        try:
-                            os.replace(output_path, new_output_path)
-                        except OSError as exc:
-                            logging.error(
-                                "failed to rename asset %s -> %s: %s",
-                                output_path,
-                                new_output_path,
-                                exc,
-                            )
-                            if (
-                                manifest_items is not None
-                                and key is not None
-                                and manifest_dict is not None
-                            ):
-                                new_record = dict(record)
-                                new_record["status"] = "pending"
-                                new_record["error"] = f"rename failed: {exc}"
-                                new_record.pop("finished_at", None)
-                                manifest_items[key] = new_record
-                                if manifest_path:
-                                    save_manifest(manifest_dict, manifest_path)
-                        else:
-                            logging.info(
-                                "renamed asset output: %s -> %s",
-                                output_path,
-                                new_output_path,
-                            )
-                            _apply_source_timestamps(src, new_output_path, src_stat)
-                            copied.append((src, dest_name))
-                            if (
-                                manifest_items is not None
-                                and key is not None
-                                and manifest_dict is not None
-                            ):
-                                new_record = dict(record)
-                                new_record["output"] = dest_name
-                                manifest_items[key] = new_record
-                                if manifest_path:
-                                    save_manifest(manifest_dict, manifest_path)
-                            continue
-                    logging.info("skip asset done: %s -> %s", src, output_path)
-                    copied.append((src, recorded_output))
-                    if manifest_dict is not None and recorded_output != record.get(
-                        "output"
-                    ):
-                        record["output"] = recorded_output
-                        manifest_items[key] = record
-                        if manifest_path:
-                            save_manifest(manifest_dict, manifest_path)
+
+            key: Optional[str] = None
+            record: Optional[dict[str, Any]] = None
+            src_stat: Optional[os.stat_result] = None
+            if manifest_items is not None:
+                cached_stat = stat_cache.get(src)
+                try:
+                    st = cached_stat if cached_stat is not None else os.stat(src)
+                    src_stat = st
+                except FileNotFoundError:
+                    logging.warning("asset missing, skipping: %s", src)
                     continue
-                logging.warning(
-                    "manifest marks asset done but output missing: %s", output_path
-                )
-                if manifest_dict is not None and manifest_items is not None:
-                    new_record = dict(record)
-                    new_record["status"] = "pending"
-                    new_record["error"] = "output missing"
-                    new_record.pop("finished_at", None)
-                    manifest_items[key] = new_record
-                    if manifest_path:
-                        save_manifest(manifest_dict, manifest_path)
-                record = None
-
-        dest_dir = os.path.dirname(dest)
-        if dest_dir and not os.path.exists(dest_dir):
-            os.makedirs(dest_dir, exist_ok=True)
+                key = src_keys.get(src) or src_key(src_abs, st)
+                record = manifest_items.get(key)
 
-        try:
-            shutil.copy2(src, dest)
-            _apply_source_timestamps(src, dest, src_stat)
-            logging.info("copied asset: %s -> %s", src, dest)
-            copied.append((src, dest_name))
-            if (
-                manifest_items is not None
-                and key is not None
-                and manifest_dict is not None
-            ):
-                manifest_items[key] = {
-                    "type": "asset",
-                    "src": src,
-                    "output": dest_name,
-                    "status": "done",
-                    "finished_at": now_utc_iso(),
-                }
-                manifest_items[key].pop("error", None)
-                if manifest_path:
-                    save_manifest(manifest_dict, manifest_path)
-        except Exception as e:
-            logging.error("failed to copy asset %s -> %s: %s", src, dest, e)
-            if (
-                manifest_items is not None
-                and key is not None
-                and manifest_dict is not None
-            ):
-                manifest_items[key] = {
-                    "type": "asset",
-                    "src": src,
-                    "output": dest_name,
-                    "status": "pending",
-                    "error": str(e),
-                }
-                manifest_items[key].pop("finished_at", None)
-                if manifest_path:
-                    save_manifest(manifest_dict, manifest_path)
+                if record and record.get("status") == "done":
+                    recorded_output = os.path.normpath(
+                        record.get("output") or dest_name
+                    )
+                    output_path = os.path.join(out_dir, recorded_output)
+                    if os.path.exists(output_path):
+                        if recorded_output != dest_name:
+                            new_output_path = os.path.join(out_dir, dest_name)
+                            new_output_dir = os.path.dirname(new_output_path)
+                            _makedirs_once(new_output_dir, made_dirs)
+                            try:
+                                os.replace(output_path, new_output_path)
+                            except OSError as exc:
+                                logging.error(
+                                    "failed to rename asset %s -> %s: %s",
+                                    output_path,
+                                    new_output_path,
+                                    exc,
+                                )
+                                if (
+                                    manifest_items is not None
+                                    and key is not None
+                                    and manifest_dict is not None
+                                ):
+                                    new_record = dict(record)
+                                    new_record["status"] = "pending"
+                                    new_record["error"] = f"rename failed: {exc}"
+                                    new_record.pop("finished_at", None)
+                                    manifest_items[key] = new_record
+                                    checkpoint()
+                            else:
+                                logging.info(
+                                    "renamed asset output: %s -> %s",
+                                    output_path,
+                                    new_output_path,
+                                )
+                                _apply_source_timestamps(src, new_output_path, src_stat)
+                                copied.append((src, dest_name))
+                                if (
+                                    manifest_items is not None
+                                    and key is not None
+                                    and manifest_dict is not None
+                                ):
+                                    new_record = dict(record)
+                                    new_record["output"] = dest_name
+                                    manifest_items[key] = new_record
+                                    checkpoint()
+                                continue
+                        logging.info("skip asset done: %s -> %s", src, output_path)
+                        copied.append((src, recorded_output))
+                        if manifest_dict is not None and recorded_output != record.get(
+                            "output"
+                        ):
+                            record["output"] = recorded_output
+                            manifest_items[key] = record
+                            checkpoint()
+                        continue
+                    logging.warning(
+                        "manifest marks asset done but output missing: %s", output_path
+                    )
+                    if manifest_dict is not None and manifest_items is not None:
+                        new_record = dict(record)
+                        new_record["status"] = "pending"
+                        new_record["error"] = "output missing"
+                        new_record.pop("finished_at", None)
+                        manifest_items[key] = new_record
+                        checkpoint()
+                    record = None
+
+            _makedirs_once(os.path.dirname(dest), made_dirs)
+
+            queued.append((src, dest, dest_name, key, src_stat))
+
+        # Copies of distinct destinations overlap on a small pool; a repeated
+        # destination is copied afterwards in input order so the last wins.
+        claimed: set[str] = set()
+        overlapped: List[_AssetCopy] = []
+        ordered: List[_AssetCopy] = []
+        for job in queued:
+            (ordered if job[1] in claimed else overlapped).append(job)
+            claimed.add(job[1])
+        if overlapped:
+            workers = min(ASSET_COPY_WORKERS, len(overlapped))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for job, error in zip(
+                    overlapped, pool.map(_copy_asset_file, overlapped)
+                ):
+                    finish_copy(job, error)
+        for job in ordered:
+            finish_copy(job, _copy_asset_file(job))
+    finally:
+        checkpoint(force=True)
     return copied
 
 
@@ -1974,6 +2666,24 @@ def main() -> None:
         default=int(os.getenv("SVT_LP", "5")),
         help="Number of SVT-AV1 lookahead processes (lp parameter).",
     )
+    ap.add_argument(
+        "--probe-workers",
+        type=int,
+        default=max(1, (os.cpu_count() or 2) // 2),
+        help="Number of inputs to probe with ffprobe concurrently.",
+    )
+    ap.add_argument(
+        "--ffprobe-threads",
+        type=int,
+        default=None,
+        help="Decoder threads per concurrent ffprobe (default: CPUs / probe workers).",
+    )
+    ap.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of videos to encode concurrently (size --svt-lp to match).",
+    )
     ap.add_argument(
         "-v",
         "--verbose",
@@ -1998,6 +2708,20 @@ def main() -> None:
         logging.error("--constant-quality must be non-negative")
         sys.exit(2)
 
+    if args.probe_workers < 1:
+        logging.error("--probe-workers must be at least 1")
+        sys.exit(2)
+
+    if args.jobs < 1:
+        logging.error("--jobs must be at least 1")
+        sys.exit(2)
+
+    if args.ffprobe_threads is None:
+        args.ffprobe_threads = max(1, (os.cpu_count() or 1) // args.probe_workers)
+    elif args.ffprobe_threads < 1:
+        logging.error("--ffprobe-threads must be at least 1")
+        sys.exit(2)
+
     canon_media = _normalize_media(args.media)
     if args.media and not canon_media:
         logging.error(
@@ -2033,23 +2757,29 @@ def main() -> None:
     if args.paths_from:
         inputs += read_paths_from(args.paths_from)
     inputs += args.input
+    # collect_all_files yields absolute, normalized paths; use them as-is below.
     all_files = collect_all_files([p for p in inputs if p], args.pattern)
     if not all_files:
         logging.error("no input files found")
         sys.exit(1)
 
+    stat_cache: dict[str, os.stat_result] = {}
+    for path in all_files:
+        try:
+            stat_cache[path] = os.stat(path)
+        except FileNotFoundError:
+            logging.warning("input missing, skipping: %s", path)
+    # manifest key of every input, computed once for all the lookups below
+    src_keys = {path: src_key(path, st) for path, st in stat_cache.items()}
+
     def manifest_covers_inputs() -> bool:
-        items = manifest.get("items")
-        if not isinstance(items, dict):
-            return False
+        items = manifest["items"]
         for src in all_files:
-            try:
-                st = os.stat(src)
-            except FileNotFoundError:
+            key = src_keys.get(src)
+            if key is None:
                 continue
-            key = src_key(os.path.abspath(src), st)
             rec = items.get(key)
-            if not isinstance(rec, dict):
+            if rec is None:
                 return False
             if rec.get("status") != "done":
                 return False
@@ -2058,7 +2788,7 @@ def main() -> None:
                 return False
             output_path = os.path.join(args.output_dir, os.path.normpath(output_rel))
             if rec.get("type") == "video":
-                if not (os.path.exists(output_path) and is_valid_media(output_path)):
+                if not _done_output_valid(rec, output_path):
                     return False
             else:
                 if not os.path.exists(output_path):
@@ -2072,49 +2802,59 @@ def main() -> None:
         logging.info("manifest: %s", manifest_path)
         return
 
-    probes_val = manifest.get("probes")
-    if not isinstance(probes_val, dict):
-        probes_val = {}
-        manifest["probes"] = probes_val
-    probe_cache = cast(dict[str, ProbeCacheEntry], probes_val)
+    probe_cache = cast(dict[str, ProbeCacheEntry], manifest["probes"])
 
-    video_flags: dict[str, bool] = {}
     video_durations: dict[str, float] = {}
-    probe_keys: dict[str, str] = {}
-    filtered_files: list[str] = []
-
-    for path in all_files:
-        try:
-            st = os.stat(path)
-        except FileNotFoundError:
-            logging.warning("input missing, skipping: %s", path)
-            continue
-
-        key = src_key(os.path.abspath(path), st)
-        probe_keys[path] = key
-        entry = probe_cache.get(key)
-        if not isinstance(entry, dict):
-            entry = None
-        if entry is None:
-            probe_result = probe_media_info(path)
-            new_entry: ProbeCacheEntry = {
-                "path": os.path.abspath(path),
-                "is_video": bool(probe_result.get("is_video")),
+    filtered_files = [path for path in all_files if path in src_keys]
+
+    unprobed = [path for path in filtered_files if src_keys[path] not in probe_cache]
+    if unprobed:
+        workers = min(args.probe_workers, len(unprobed))
+        unsaved_probes = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                pool.submit(probe_media_info, path, threads=args.ffprobe_threads): path
+                for path in unprobed
             }
-            duration_value = probe_result.get("duration")
-            if duration_value is not None:
-                new_entry["duration"] = float(duration_value)
-            probe_cache[key] = new_entry
-            entry = new_entry
-            save_manifest(manifest, manifest_path)
+            try:
+                for future in as_completed(futures):
+                    path = futures[future]
+                    probe_result = future.result()
+                    new_entry: ProbeCacheEntry = {
+                        "path": path,
+                        "is_video": bool(probe_result.get("is_video")),
+                    }
+                    duration_value = probe_result.get("duration")
+                    if duration_value is not None:
+                        new_entry["duration"] = float(duration_value)
+                    if "creation_date" in probe_result:
+                        new_entry["creation_date"] = probe_result["creation_date"]
+                    probe_cache[src_keys[path]] = new_entry
+                    unsaved_probes += 1
+                    if unsaved_probes >= MANIFEST_SAVE_EVERY:
+                        save_manifest(manifest, manifest_path)
+                        unsaved_probes = 0
+            finally:
+                # On interrupt, drop queued probes so shutdown only waits on
+                # the ones already running.
+                for future in futures:
+                    future.cancel()
+                if unsaved_probes:
+                    save_manifest(manifest, manifest_path)
 
+    # one pass partitions the inputs; durations are only kept for videos
+    videos: list[str] = []
+    assets: list[str] = []
+    for path in filtered_files:
+        entry = probe_cache[src_keys[path]]
         is_video = bool(entry.get("is_video"))
-        duration_val = entry.get("duration")
-        if isinstance(duration_val, (int, float)):
-            video_durations[path] = float(duration_val)
-
-        video_flags[path] = is_video
-        filtered_files.append(path)
+        if is_video:
+            videos.append(path)
+            duration_val = entry.get("duration")
+            if isinstance(duration_val, (int, float)):
+                video_durations[path] = float(duration_val)
+        else:
+            assets.append(path)
         if args.verbose:
             if is_video:
                 logging.info("video: %s", path)
@@ -2122,9 +2862,7 @@ def main() -> None:
                 logging.info("not a video: %s", path)
 
     all_files = filtered_files
-    videos = [p for p in all_files if video_flags.get(p)]
-    assets = [p for p in all_files if not video_flags.get(p)]
-    video_set = {p for p, is_video in video_flags.items() if is_video}
+    video_set = set(videos)
 
     logging.info("media preset: %s", canon_media or "none")
     logging.info("outputs: %s", args.output_dir)
@@ -2136,12 +2874,7 @@ def main() -> None:
     use_constant_quality = args.constant_quality is not None
 
     target_bytes = parse_size(target_size_str)
-    total_input_bytes = 0
-    for src in all_files:
-        try:
-            total_input_bytes += os.path.getsize(src)
-        except FileNotFoundError:
-            pass
+    total_input_bytes = sum(stat_cache[src].st_size for src in all_files)
 
     if not use_constant_quality and total_input_bytes <= target_bytes:
         action = "move" if args.move_if_fit else "copy"
@@ -2150,19 +2883,17 @@ def main() -> None:
         )
         manifest["items"] = {}
         for src in all_files:
-            st = os.stat(src)
             dest = os.path.join(args.output_dir, os.path.basename(src))
             try:
                 if args.move_if_fit:
                     shutil.move(src, dest)
                 else:
-                    shutil.copy2(src, dest)
+                    _fast_copy(src, dest)
             except Exception as e:
                 logging.error("%s failed %s -> %s: %s", action, src, dest, e)
                 sys.exit(1)
             if src in video_set:
-                key = src_key(os.path.abspath(src), st)
-                manifest["items"][key] = {
+                manifest["items"][src_keys[src]] = {
                     "type": "video",
                     "src": src,
                     "output": os.path.basename(src),
@@ -2173,36 +2904,42 @@ def main() -> None:
         logging.warning("done; no re-encoding needed")
         return
 
-    asset_bytes = 0
-    for src in assets:
-        try:
-            asset_bytes += os.path.getsize(src)
-        except FileNotFoundError:
-            pass
+    asset_bytes = sum(stat_cache[src].st_size for src in assets)
 
     audio_bps = kbps_to_bps(args.audio_bitrate)
-    total_duration = 0.0
-    durations: List[float] = []
-    per_video_duration: Dict[str, float] = {}
-    for src in videos:
-        duration = video_durations.get(src)
-        if duration is None:
+    backfilled_durations = False
+    missing_durations = [src for src in videos if src not in video_durations]
+    if missing_durations:
+        # one ffprobe per miss; run them side by side, report in input order
+        with ThreadPoolExecutor(
+            max_workers=min(args.probe_workers, len(missing_durations))
+        ) as pool:
+            duration_futures = [
+                (src, pool.submit(ffprobe_duration, src)) for src in missing_durations
+            ]
             try:
-                duration = ffprobe_duration(src)
-            except Exception as exc:
-                logging.error("failed to determine duration for %s: %s", src, exc)
-                sys.exit(1)
-            probe_key = probe_keys.get(src)
-            if probe_key:
-                cache_entry = probe_cache.get(probe_key)
-                if isinstance(cache_entry, dict):
-                    cache_entry["duration"] = float(duration)
-                    probe_cache[probe_key] = cache_entry
-                    save_manifest(manifest, manifest_path)
-            video_durations[src] = float(duration)
-        durations.append(float(duration))
-        total_duration += float(duration)
-        per_video_duration[src] = float(duration)
+                for src, duration_future in duration_futures:
+                    try:
+                        duration = duration_future.result()
+                    except Exception as exc:
+                        logging.error(
+                            "failed to determine duration for %s: %s", src, exc
+                        )
+                        sys.exit(1)
+                    probe_key = src_keys.get(src)
+                    if probe_key:
+                        cache_entry = probe_cache.get(probe_key)
+                        if cache_entry is not None:
+                            cache_entry["duration"] = float(duration)
+                            probe_cache[probe_key] = cache_entry
+                            backfilled_durations = True
+                    video_durations[src] = float(duration)
+            finally:
+                for _, duration_future in duration_futures:
+                    duration_future.cancel()
+    if backfilled_durations:
+        save_manifest(manifest, manifest_path)
+    total_duration = sum(video_durations[src] for src in videos)
 
     audio_copy_specs: Dict[str, set[str]] = {}
     video_copy_specs: Dict[str, set[str]] = {}
@@ -2217,16 +2954,16 @@ def main() -> None:
     input_file_sizes: Dict[str, int] = {}
 
     for src in videos:
-        try:
-            input_file_sizes[src] = os.path.getsize(src)
-        except FileNotFoundError:
-            input_file_sizes[src] = 0
+        input_file_sizes[src] = stat_cache[src].st_size
 
     def _append_record(
         collection: Dict[str, List[BudgetDebugEntry]],
         src_path: str,
         entry: BudgetDebugEntry,
     ) -> None:
+        # the records only feed the -v budget report below
+        if not args.verbose:
+            return
         copied = cast(BudgetDebugEntry, dict(entry))
         copied.setdefault("source", os.path.basename(src_path))
         collection.setdefault(src_path, []).append(copied)
@@ -2236,28 +2973,40 @@ def main() -> None:
         if videos and total_duration <= 0:
             logging.error("total video duration is zero; cannot proceed")
             sys.exit(1)
-        for src in videos:
-            duration = per_video_duration.get(src, 0.0)
-            stream_bytes = int((audio_bps / 8.0) * float(duration))
-            total_audio_bytes += stream_bytes
-            audio_budget_debug.append(
-                {
-                    "source": os.path.basename(src),
-                    "spec": "a:enc",
-                    "stype": "a",
-                    "bytes": stream_bytes,
-                    "method": "constant-quality",
-                    "bitrate": float(audio_bps),
-                }
-            )
+        audio_bytes_per_second = audio_bps / 8.0
+        audio_bytes = [
+            int(audio_bytes_per_second * video_durations[src]) for src in videos
+        ]
+        total_audio_bytes = sum(audio_bytes)
+        audio_budget_debug = [
+            {
+                "source": os.path.basename(src),
+                "spec": "a:enc",
+                "stype": "a",
+                "bytes": stream_bytes,
+                "method": "constant-quality",
+                "bitrate": float(audio_bps),
+            }
+            for src, stream_bytes in zip(videos, audio_bytes)
+        ]
     else:
-        for src in videos:
-            duration = per_video_duration.get(src, 0.0)
+
+        def inspect_streams(src: str) -> List[StreamInfo]:
             try:
-                stream_infos = _probe_stream_infos_only(src)
+                return _probe_stream_infos_only(src)
             except Exception as exc:
                 logging.warning("failed to inspect streams for %s: %s", src, exc)
-                stream_infos = []
+                return []
+
+        # each layout is an independent ffprobe run; overlap them up front
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(args.probe_workers, len(videos)))
+        ) as inspectors:
+            layouts = dict(zip(videos, inspectors.map(inspect_streams, videos)))
+        for src in videos:
+            src_name = os.path.basename(src)
+            duration = video_durations[src]
+            stream_infos = layouts[src]
             audio_copy_specs.setdefault(src, set())
             video_copy_specs.setdefault(src, set())
             audio_found = False
@@ -2340,7 +3089,7 @@ def main() -> None:
                             stream_bytes = int((bitrate / 8.0) * stream_duration)
                             stream_method = "copy"
                         audio_copy_entry: BudgetDebugEntry = {
-                            "source": os.path.basename(src),
+                            "source": src_name,
                             "spec": spec_text,
                             "stype": "a",
                             "bytes": stream_bytes,
@@ -2352,7 +3101,7 @@ def main() -> None:
                     else:
                         stream_bytes = int((audio_bps / 8.0) * stream_duration)
                         audio_reencode_entry: BudgetDebugEntry = {
-                            "source": os.path.basename(src),
+                            "source": src_name,
                             "spec": spec_text,
                             "stype": "a",
                             "bytes": stream_bytes,
@@ -2371,7 +3120,7 @@ def main() -> None:
                             source_path=src,
                             stream_spec=spec_text,
                             debug_entries=other_stream_budget_debug,
-                            debug_source=os.path.basename(src),
+                            debug_source=src_name,
                         )
                         other_stream_bytes += estimated
                         attachment_budget_bytes += estimated
@@ -2381,7 +3130,7 @@ def main() -> None:
                             record_entry = cast(
                                 BudgetDebugEntry,
                                 {
-                                    "source": os.path.basename(src),
+                                    "source": src_name,
                                     "spec": spec_text,
                                     "stype": "t",
                                     "bytes": estimated,
@@ -2462,7 +3211,7 @@ def main() -> None:
                         source_path=src,
                         stream_spec=spec_text,
                         debug_entries=other_stream_budget_debug,
-                        debug_source=os.path.basename(src),
+                        debug_source=src_name,
                     )
                     other_stream_bytes += estimated
                     if stype == "t":
@@ -2473,7 +3222,7 @@ def main() -> None:
                         record_entry = cast(
                             BudgetDebugEntry,
                             {
-                                "source": os.path.basename(src),
+                                "source": src_name,
                                 "spec": spec_text,
                                 "stype": stype,
                                 "bytes": estimated,
@@ -2493,7 +3242,7 @@ def main() -> None:
                 stream_bytes = int((audio_bps / 8.0) * duration)
                 total_audio_bytes += stream_bytes
                 audio_fallback_entry: BudgetDebugEntry = {
-                    "source": os.path.basename(src),
+                    "source": src_name,
                     "spec": "a:fallback",
                     "stype": "a",
                     "bytes": stream_bytes,
@@ -2748,8 +3497,8 @@ def main() -> None:
 
     output_container_share: Dict[str, int] = {src: 0 for src in videos}
     if videos and not use_constant_quality and reserved > 0:
-        basis_values = [per_video_duration.get(src, 0.0) for src in videos]
-        total_basis = sum(basis_values)
+        basis_values = [video_durations[src] for src in videos]
+        total_basis = total_duration
         shares = [0 for _ in videos]
         if total_basis > 0:
             fractions: List[Tuple[float, int]] = []
@@ -2785,14 +3534,9 @@ def main() -> None:
         for src in videos:
             file_size = input_file_sizes.get(src, 0)
             display_name = os.path.basename(src)
-            input_entries: List[BudgetDebugEntry] = [
-                cast(BudgetDebugEntry, dict(entry))
-                for entry in input_stream_records.get(src, [])
-            ]
-            output_entries: List[BudgetDebugEntry] = [
-                cast(BudgetDebugEntry, dict(entry))
-                for entry in output_stream_records.get(src, [])
-            ]
+            # _append_record already stored private copies; adjust them in place
+            input_entries = input_stream_records.get(src, [])
+            output_entries = output_stream_records.get(src, [])
             input_stream_total = sum(_entry_bytes(entry) for entry in input_entries)
             diff = file_size - input_stream_total
             if diff < 0 and input_entries:
@@ -2996,27 +3740,90 @@ def main() -> None:
         logging.info("no videos to encode")
 
     output_by_input: dict[str, str] = {}
-    video_metadata: list[dict[str, Any]] = []
+    video_metadata: list[Optional[dict[str, Any]]] = [None] * len(videos)
     encoded_count = 0
-    for src, _dur in zip(videos, durations):
-        st = os.stat(src)
-        stem = sanitize_base(pathlib.Path(src).stem)
-        ext = pathlib.Path(src).suffix
+    writer = ManifestWriter(manifest, manifest_path)
+    # guards manifest records and the writer when --jobs runs encodes in parallel
+    manifest_lock = threading.RLock()
+
+    def stage_path_for(path: str) -> str:
+        root, path_ext = os.path.splitext(os.path.basename(path))
+        return os.path.join(
+            args.stage_dir, f"{sanitize_base(root)}.{_short_hash(path)}{path_ext}"
+        )
+
+    # Copy the next pending source into staging while the current one encodes.
+    stager = ThreadPoolExecutor(max_workers=1)
+    prefetched: dict[str, Future[None]] = {}
+
+    def prefetch_after(idx: int) -> None:
+        start = idx + 1
+        for nxt in videos[start:]:
+            nxt_rec = manifest["items"].get(src_keys[nxt])
+            if nxt_rec is not None and nxt_rec.get("status") == "done":
+                continue
+            if nxt not in prefetched:
+                nxt_stage = stage_path_for(nxt)
+                if args.verbose:
+                    logging.info("prefetching -> %s", nxt_stage)
+                prefetched[nxt] = stager.submit(_stage_source, nxt, nxt_stage)
+            return
+
+    # loop-invariant pieces of every encode/remux invocation
+    encode_env = dict(os.environ, SVT_LOG="4" if args.verbose else "2")
+    children = _ChildProcesses()
+    # serial encodes keep subprocess.run: the signal's exception unwinds the
+    # calling thread, which kills the child on the way out
+    run_child = children.run if args.jobs > 1 else subprocess.run
+    # concurrent encodes share the CPUs, so cap each one's decoder and filter
+    # threads instead of letting every ffmpeg size its pools to the machine
+    encode_thread_args: List[str] = []
+    if args.jobs > 1:
+        encode_threads = str(max(1, (os.cpu_count() or 1) // args.jobs))
+        encode_thread_args = [
+            "-threads",
+            encode_threads,
+            "-filter_threads",
+            encode_threads,
+        ]
+    ffmpeg_log_args = (
+        ["-stats", "-loglevel", "info"]
+        if args.verbose
+        else ["-hide_banner", "-loglevel", "warning"]
+    )
+    # everything up to the staged input path; only the maps and codecs vary
+    ffmpeg_input_prefix = (
+        "ffmpeg",
+        *ffmpeg_log_args,
+        "-y",
+        "-ignore_unknown",
+        *encode_thread_args,
+        *FFMPEG_INPUT_FLAGS,
+        "-i",
+    )
+
+    made_dirs = {args.output_dir}
+
+    def encode_one(idx: int, src: str) -> None:
+        nonlocal encoded_count
+        st = stat_cache[src]
+        src_dir, src_base = os.path.split(src)
+        src_root, ext = os.path.splitext(src_base)
+        stem = sanitize_base(src_root)
         output_ext = OUT_EXT
         out_name = _lowercase_suffix_str(f"{stem}{args.name_suffix}{output_ext}")
         metadata = {
-            "dir": os.path.abspath(os.path.dirname(src)),
-            "original": os.path.basename(src),
+            "dir": src_dir,
+            "original": src_base,
             "desired": out_name,
             "ext_changed": ext.lower() != output_ext.lower(),
             "used_original": False,
         }
-        video_metadata.append(metadata)
-        h = _short_hash(os.path.abspath(src))
-        stage_src = os.path.join(args.stage_dir, f"{stem}.{h}{ext}")
+        video_metadata[idx] = metadata
+        h = _short_hash(src)
+        stage_src = stage_path_for(src)
         stage_part = os.path.join(args.stage_dir, out_name + ".part")
-        remux_output = stage_part + ".mkvmerge"
-        key = src_key(os.path.abspath(src), st)
+        key = src_keys[src]
         rec = manifest["items"].get(
             key, {"type": "video", "src": src, "output": out_name, "status": "pending"}
         )
@@ -3028,88 +3835,77 @@ def main() -> None:
             output_rel = out_name
         else:
             output_rel = _lowercase_suffix_str(output_rel)
-        rec["output"] = output_rel
-        output_by_input[os.path.abspath(src)] = os.path.normpath(output_rel)
+        with manifest_lock:
+            if rec.get("output") != output_rel:
+                rec["output"] = output_rel
+                # a corrected name on a recorded item must reach the manifest
+                # even when the item is skipped as done
+                if key in manifest["items"]:
+                    writer.mark_dirty(key)
+        output_by_input[src] = os.path.normpath(output_rel)
         final_path = os.path.join(args.output_dir, output_rel)
-        final_dir = os.path.dirname(final_path)
-        if final_dir and not os.path.exists(final_dir):
-            os.makedirs(final_dir, exist_ok=True)
+        _makedirs_once(os.path.dirname(final_path), made_dirs)
         part_path = final_path + ".part"
 
         def mark_pending(error: Optional[str] = None) -> None:
-            rec["status"] = "pending"
-            rec.pop("started_at", None)
-            rec.pop("finished_at", None)
-            if error:
-                rec["error"] = error
-            else:
-                rec.pop("error", None)
-            manifest["items"][key] = rec
-            save_manifest(manifest, manifest_path)
+            with manifest_lock:
+                rec["status"] = "pending"
+                rec.pop("started_at", None)
+                rec.pop("finished_at", None)
+                if error:
+                    rec["error"] = error
+                else:
+                    rec.pop("error", None)
+                manifest["items"][key] = rec
+                writer.mark_dirty(key)
 
         if rec.get("status") == "encoding_started":
             logging.info("retrying previously started encode for %s", src)
             mark_pending()
 
-        for stale in (
-            part_path,
-            stage_part,
-            remux_output,
-        ):
-            if os.path.exists(stale):
-                try:
-                    os.remove(stale)
-                except FileNotFoundError:
-                    pass
+        for stale in (part_path, stage_part):
+            _silent_unlink(stale)
 
         if rec.get("status") == "done":
             if os.path.exists(final_path):
-                try:
-                    if not is_valid_media(final_path):
-                        logging.debug(
-                            "manifest marks video done but validation failed: %s",
-                            final_path,
-                        )
-                except Exception:
-                    logging.debug(
-                        "manifest marks video done but validation errored: %s",
-                        final_path,
-                    )
                 logging.info("skip done: %s", final_path)
-                continue
+                return
             logging.warning(
                 "manifest marks video done but output missing: %s", final_path
             )
             mark_pending("output missing")
 
-        if os.path.exists(final_path) and not is_valid_media(final_path):
-            try:
-                os.remove(final_path)
-            except FileNotFoundError:
-                pass
+        if os.path.exists(final_path) and not (
+            _matroska_header_ok(final_path) and is_valid_media(final_path)
+        ):
+            _silent_unlink(final_path)
 
         original_creation_date: Optional[str] = None
         try:
-            if os.path.exists(stage_src):
-                try:
-                    os.remove(stage_src)
-                except FileNotFoundError:
-                    pass
-            if args.verbose:
-                logging.info("staging -> %s", stage_src)
-            shutil.copy2(src, stage_src)
-            original_creation_date = get_container_creation_date(stage_src)
+            staged = prefetched.pop(src, None)
+            if staged is not None:
+                staged.result()
+            else:
+                if args.verbose:
+                    logging.info("staging -> %s", stage_src)
+                _stage_source(src, stage_src)
+            if args.jobs == 1:
+                prefetch_after(idx)
+            cached_probe = probe_cache.get(key)
+            if cached_probe is not None and "creation_date" in cached_probe:
+                original_creation_date = cached_probe["creation_date"]
+            else:
+                original_creation_date = get_container_creation_date(stage_src)
         except Exception as e:
             logging.error("failed to stage source %s -> %s: %s", src, stage_src, e)
             mark_pending(f"failed to stage source: {e}")
-            continue
+            return
 
         audio_kbps = max(1, int(audio_bps / 1000))
         streams_root = pathlib.Path(os.path.join(args.stage_dir, f"{stem}.{h}.streams"))
-        if streams_root.exists():
-            shutil.rmtree(streams_root, ignore_errors=True)
+        shutil.rmtree(streams_root, ignore_errors=True)
 
-        finally_cleanup_files: List[str] = [stage_part, remux_output, stage_src]
+        finally_cleanup_files: List[str] = [stage_part, stage_src]
 
         try:
             try:
@@ -3119,32 +3915,36 @@ def main() -> None:
             except Exception as exc:
                 logging.error("failed to dump streams for %s: %s", src, exc)
                 mark_pending("failed to dump streams")
-                continue
+                return
             exports = dumped["exports"]
+            # parsed once; reused by the encode, verification and attach passes
+            export_paths = [pathlib.Path(export["path"]) for export in exports]
             metadata_sidecar = dumped["metadata_path"]
             container_tags = dumped.get("container_tags", {})
 
             stream_infos = dumped.get("stream_infos", [])
             info_by_index = {info["index"]: info for info in stream_infos}
 
-            video_selection = _pick_real_video_stream_index(stage_src)
+            video_selection = dumped.get("video_selection")
+            if video_selection is None:
+                video_selection = _pick_real_video_stream_index(stage_src)
             if video_selection is None:
                 logging.error("no video stream found for %s", src)
                 mark_pending("no video stream found")
-                continue
+                return
 
             video_stream_index, video_stream_spec = video_selection
             video_stream_info = info_by_index.get(video_stream_index)
             if video_stream_info is None:
                 logging.error("missing video stream metadata for %s", src)
                 mark_pending("missing video stream metadata")
-                continue
+                return
 
             primary_video_spec = video_stream_info.get("spec") or video_stream_spec
             if not primary_video_spec:
                 logging.error("missing video stream specifier for %s", src)
                 mark_pending("missing video stream specifier")
-                continue
+                return
 
             video_infos = sorted(
                 [info for info in stream_infos if info["stype"] == "v"],
@@ -3167,38 +3967,25 @@ def main() -> None:
                 key=lambda item: item["index"],
             )
 
-            rec.pop("error", None)
-            rec.update(
-                {
-                    "status": "encoding_started",
-                    "started_at": now_utc_iso(),
-                    "output": output_rel,
-                }
-            )
-            manifest["items"][key] = rec
-            save_manifest(manifest, manifest_path)
-
-            env = os.environ.copy()
-            env["SVT_LOG"] = "4" if args.verbose else "2"
+            with manifest_lock:
+                rec.pop("error", None)
+                rec.update(
+                    {
+                        "status": "encoding_started",
+                        "started_at": now_utc_iso(),
+                        "output": output_rel,
+                    }
+                )
+                manifest["items"][key] = rec
+                writer.mark_dirty(key)
+                # the encode can run for hours; persist everything up to here first
+                writer.flush()
 
-            base_name = pathlib.Path(src).stem
+            base_name = src_root
             encode_output_path = streams_root / f"{base_name}.encoded.mkv"
             finally_cleanup_files.append(str(encode_output_path))
 
-            encode_cmd = ["ffmpeg"]
-            if args.verbose:
-                encode_cmd += ["-stats", "-loglevel", "info"]
-            else:
-                encode_cmd += ["-hide_banner", "-loglevel", "warning"]
-            encode_cmd += [
-                "-y",
-                "-ignore_unknown",
-            ]
-            encode_cmd += FFMPEG_INPUT_FLAGS
-            encode_cmd += [
-                "-i",
-                stage_src,
-            ]
+            encode_cmd = [*ffmpeg_input_prefix, stage_src]
 
             encode_outputs: List[List[str]] = []
 
@@ -3242,7 +4029,7 @@ def main() -> None:
             if "v" not in main_stream_types:
                 logging.error("no video streams mapped for %s", src)
                 mark_pending("no video streams mapped")
-                continue
+                return
 
             main_output_opts += _metadata_copy_args(main_stream_types)
             main_output_opts += FFMPEG_OUTPUT_FLAGS
@@ -3291,6 +4078,7 @@ def main() -> None:
                         f"{audio_kbps}k",
                     ]
             main_output_opts += codec_opts
+            reencoding = "libsvtav1" in codec_opts or "libopus" in codec_opts
             if "s" in main_stream_types:
                 main_output_opts += ["-c:s", "copy"]
             if "t" in main_stream_types:
@@ -3302,17 +4090,13 @@ def main() -> None:
             ]
             encode_outputs.append(main_output_opts)
 
-            for export in exports:
+            for export, export_path in zip(exports, export_paths):
                 spec_val = export.get("spec")
                 if not isinstance(spec_val, str) or not spec_val:
                     continue
                 spec = spec_val
-                export_path = pathlib.Path(export["path"])
                 export_path.parent.mkdir(parents=True, exist_ok=True)
-                try:
-                    export_path.unlink()
-                except FileNotFoundError:
-                    pass
+                _silent_unlink(str(export_path))
                 finally_cleanup_files.append(str(export_path))
                 export_stream_types = [export["stype"]]
                 extra_opts: List[str] = ["-map", f"0:{spec}"]
@@ -3329,21 +4113,29 @@ def main() -> None:
                 encode_cmd.extend(output_opts)
 
             _print_command(encode_cmd)
-            encode_proc = subprocess.run(encode_cmd, env=env)
+            encode_proc = run_child(encode_cmd, env=encode_env)
             if encode_proc.returncode != 0:
                 logging.error("encode failed for %s", src)
                 mark_pending(f"encode exited with code {encode_proc.returncode}")
-                continue
+                return
 
-            if not encode_output_path.exists():
+            try:
+                encoded_size = encode_output_path.stat().st_size
+            except FileNotFoundError:
                 logging.error("expected encoded output missing for %s", src)
                 mark_pending("encoded output missing")
-                continue
+                return
+
+            staged_names = _staged_file_names(streams_root)
+
+            def is_staged(path: pathlib.Path) -> bool:
+                if path.parent == streams_root:
+                    return path.name in staged_names
+                return path.exists()
 
             missing_exports = False
-            for export in exports:
-                export_path = pathlib.Path(export["path"])
-                if not export_path.exists():
+            for export, export_path in zip(exports, export_paths):
+                if not is_staged(export_path):
                     logging.error(
                         "expected auxiliary export missing for %s stream %s",
                         src,
@@ -3352,114 +4144,100 @@ def main() -> None:
                     missing_exports = True
             if missing_exports:
                 mark_pending("auxiliary export missing")
-                continue
+                return
 
             all_video_mkv_ok = bool(video_infos) and all(
                 info.get("mkv_ok") for info in video_infos
             )
             all_audio_mkv_ok = all(info.get("mkv_ok") for info in audio_infos)
+            # a pure stream copy already is the original remux; no need to redo it
             perform_size_check = (
-                bool(video_infos) and all_video_mkv_ok and all_audio_mkv_ok
+                reencoding
+                and bool(video_infos)
+                and all_video_mkv_ok
+                and all_audio_mkv_ok
             )
 
             selected_output_path = encode_output_path
-            if perform_size_check:
-                try:
-                    encoded_size = encode_output_path.stat().st_size
-                    original_size = os.path.getsize(stage_src)
-                except OSError as exc:
-                    logging.warning("failed to compare sizes for %s: %s", src, exc)
+            # staging is a byte copy, so the source stat already has its size
+            if perform_size_check and encoded_size >= st.st_size:
+                logging.info(
+                    "encoded output larger than source; considering original remux for %s",
+                    src,
+                )
+                remux_source_path = streams_root / f"{base_name}.original.mkv"
+                finally_cleanup_files.append(str(remux_source_path))
+                remux_cmd = [*ffmpeg_input_prefix, stage_src]
+                remux_stream_types: List[str] = []
+                mapped_video = False
+                if all_video_mkv_ok:
+                    for info in video_infos:
+                        spec_val = info.get("spec")
+                        if not isinstance(spec_val, str) or not spec_val:
+                            continue
+                        remux_cmd += ["-map", f"0:{spec_val}"]
+                        mapped_video = True
+                if mapped_video:
+                    remux_stream_types.append("v")
+                mapped_audio = False
+                if all_audio_mkv_ok:
+                    for info in audio_infos:
+                        spec_val = info.get("spec")
+                        if not isinstance(spec_val, str) or not spec_val:
+                            continue
+                        remux_cmd += ["-map", f"0:{spec_val}"]
+                        mapped_audio = True
+                if mapped_audio:
+                    remux_stream_types.append("a")
+                for info in subtitle_infos:
+                    spec_val = info.get("spec")
+                    if not isinstance(spec_val, str) or not spec_val:
+                        continue
+                    remux_cmd += ["-map", f"0:{spec_val}"]
+                if subtitle_infos:
+                    remux_stream_types.append("s")
+                for info in attachment_infos:
+                    spec_val = info.get("spec")
+                    if not isinstance(spec_val, str) or not spec_val:
+                        continue
+                    remux_cmd += ["-map", f"0:{spec_val}"]
+                if attachment_infos:
+                    remux_stream_types.append("t")
+                remux_cmd += _metadata_copy_args(remux_stream_types)
+                remux_cmd += FFMPEG_OUTPUT_FLAGS
+                if mapped_video:
+                    remux_cmd += ["-c:v", "copy"]
+                if mapped_audio:
+                    remux_cmd += ["-c:a", "copy"]
+                if subtitle_infos:
+                    remux_cmd += ["-c:s", "copy"]
+                if attachment_infos:
+                    remux_cmd += ["-c:t", "copy"]
+                remux_cmd += [
+                    "-f",
+                    "matroska",
+                    str(remux_source_path),
+                ]
+                _print_command(remux_cmd)
+                remux_proc = run_child(remux_cmd)
+                if remux_proc.returncode != 0:
+                    logging.warning(
+                        "original remux failed for %s; keeping encoded output",
+                        src,
+                    )
+                elif not remux_source_path.exists():
+                    logging.warning(
+                        "expected original remux output missing for %s; keeping encoded output",
+                        src,
+                    )
                 else:
-                    if encoded_size >= original_size:
-                        logging.info(
-                            "encoded output larger than source; considering original remux for %s",
-                            src,
-                        )
-                        remux_source_path = streams_root / f"{base_name}.original.mkv"
-                        finally_cleanup_files.append(str(remux_source_path))
-                        remux_cmd = ["ffmpeg"]
-                        if args.verbose:
-                            remux_cmd += ["-stats", "-loglevel", "info"]
-                        else:
-                            remux_cmd += ["-hide_banner", "-loglevel", "warning"]
-                        remux_cmd += [
-                            "-y",
-                            "-ignore_unknown",
-                        ]
-                        remux_cmd += FFMPEG_INPUT_FLAGS
-                        remux_cmd += [
-                            "-i",
-                            stage_src,
-                        ]
-                        remux_stream_types: List[str] = []
-                        mapped_video = False
-                        if all_video_mkv_ok:
-                            for info in video_infos:
-                                spec_val = info.get("spec")
-                                if not isinstance(spec_val, str) or not spec_val:
-                                    continue
-                                remux_cmd += ["-map", f"0:{spec_val}"]
-                                mapped_video = True
-                        if mapped_video:
-                            remux_stream_types.append("v")
-                        mapped_audio = False
-                        if all_audio_mkv_ok:
-                            for info in audio_infos:
-                                spec_val = info.get("spec")
-                                if not isinstance(spec_val, str) or not spec_val:
-                                    continue
-                                remux_cmd += ["-map", f"0:{spec_val}"]
-                                mapped_audio = True
-                        if mapped_audio:
-                            remux_stream_types.append("a")
-                        for info in subtitle_infos:
-                            spec_val = info.get("spec")
-                            if not isinstance(spec_val, str) or not spec_val:
-                                continue
-                            remux_cmd += ["-map", f"0:{spec_val}"]
-                        if subtitle_infos:
-                            remux_stream_types.append("s")
-                        for info in attachment_infos:
-                            spec_val = info.get("spec")
-                            if not isinstance(spec_val, str) or not spec_val:
-                                continue
-                            remux_cmd += ["-map", f"0:{spec_val}"]
-                        if attachment_infos:
-                            remux_stream_types.append("t")
-                        remux_cmd += _metadata_copy_args(remux_stream_types)
-                        remux_cmd += FFMPEG_OUTPUT_FLAGS
-                        if mapped_video:
-                            remux_cmd += ["-c:v", "copy"]
-                        if mapped_audio:
-                            remux_cmd += ["-c:a", "copy"]
-                        if subtitle_infos:
-                            remux_cmd += ["-c:s", "copy"]
-                        if attachment_infos:
-                            remux_cmd += ["-c:t", "copy"]
-                        remux_cmd += [
-                            "-f",
-                            "matroska",
-                            str(remux_source_path),
-                        ]
-                        _print_command(remux_cmd)
-                        remux_proc = subprocess.run(remux_cmd)
-                        if remux_proc.returncode != 0:
-                            logging.warning(
-                                "original remux failed for %s; keeping encoded output",
-                                src,
-                            )
-                        elif not remux_source_path.exists():
-                            logging.warning(
-                                "expected original remux output missing for %s; keeping encoded output",
-                                src,
-                            )
-                        else:
-                            selected_output_path = remux_source_path
-                            metadata["used_original"] = True
+                    selected_output_path = remux_source_path
+                    metadata["used_original"] = True
+                    # the losing encode is dead weight on the stage disk from here on
+                    _silent_unlink(str(encode_output_path))
 
             attachment_entries: List[Tuple[pathlib.Path, str, str]] = []
-            for export in exports:
-                export_path = pathlib.Path(export["path"])
+            for export, export_path in zip(exports, export_paths):
                 stream = export.get("stream", {})
                 codec_hint = cast(
                     str,
@@ -3474,7 +4252,7 @@ def main() -> None:
                     (export_path, description, _guess_mime_type(export_path))
                 )
                 packet_sidecar = _packet_sidecar_path(export, export_path)
-                if packet_sidecar is not None and packet_sidecar.exists():
+                if packet_sidecar is not None and is_staged(packet_sidecar):
                     attachment_entries.append(
                         (
                             packet_sidecar,
@@ -3484,7 +4262,7 @@ def main() -> None:
                     )
 
             if metadata_sidecar is not None:
-                if metadata_sidecar.exists():
+                if is_staged(metadata_sidecar):
                     attachment_entries.append(
                         (
                             metadata_sidecar,
@@ -3522,7 +4300,7 @@ def main() -> None:
             metadata_args: List[str]
             try:
                 metadata_args = _prepare_container_metadata_args(
-                    remux_output,
+                    stage_part,
                     creation_date_to_apply,
                     container_tags,
                     finally_cleanup_files,
@@ -3534,33 +4312,33 @@ def main() -> None:
                     exc,
                 )
                 mark_pending("failed to prepare container metadata")
-                continue
+                return
 
             attachment_args = _build_attachment_args(attachment_entries)
 
+            # mkvmerge writes the staged result directly; no rename before publishing
             mux_cmd = [
                 "mkvmerge",
                 "-o",
-                remux_output,
+                stage_part,
                 "--disable-track-statistics-tags",
             ]
             mux_cmd += metadata_args
             mux_cmd += attachment_args
             mux_cmd.append(str(selected_output_path))
             _print_command(mux_cmd)
-            mux_proc = subprocess.run(mux_cmd)
+            mux_proc = run_child(mux_cmd)
             if mux_proc.returncode != 0:
                 logging.error("mkvmerge failed for %s", src)
                 mark_pending(f"mkvmerge exited with code {mux_proc.returncode}")
-                continue
+                return
 
-            if not os.path.exists(remux_output):
+            try:
+                mux_size = os.path.getsize(stage_part)
+            except FileNotFoundError:
                 logging.error("expected remuxed output missing for %s", src)
                 mark_pending("remuxed output missing")
-                continue
-
-            try:
-                mux_size = os.path.getsize(remux_output)
+                return
             except OSError as exc:
                 logging.info(
                     "mkv size after mkvmerge for %s: unavailable (%s)",
@@ -3575,75 +4353,133 @@ def main() -> None:
                 )
 
             try:
-                os.replace(remux_output, stage_part)
-            except OSError as exc:
-                logging.error("failed to finalize remuxed output for %s: %s", src, exc)
-                mark_pending("failed to finalize remuxed output")
-                continue
-
-            try:
-                shutil.copy2(stage_part, part_path)
-                _apply_source_timestamps(src, part_path, st)
+                _apply_source_timestamps(src, stage_part, st)
+                if not _rename_into_place(stage_part, final_path):
+                    _fast_copy(stage_part, part_path, copy_stat=False)
+                    _apply_source_timestamps(src, part_path, st)
+                    os.replace(part_path, final_path)
             except Exception as e:
                 logging.error("failed to copy staged result to output: %s", e)
                 mark_pending("failed to copy staged result")
-                continue
+                return
+            # neither the (possibly hard-linked) stage nor the output is read again
+            _drop_page_cache(stage_src)
+            _drop_page_cache(final_path)
 
-            os.replace(part_path, final_path)
+            final_stamp = _output_stamp(os.stat(final_path))
 
-            rec.update({"status": "done", "finished_at": now_utc_iso()})
-            manifest["items"][key] = rec
-            save_manifest(manifest, manifest_path)
-            encoded_count += 1
+            with manifest_lock:
+                rec.update(
+                    {
+                        "status": "done",
+                        "finished_at": now_utc_iso(),
+                        "validated": final_stamp,
+                    }
+                )
+                manifest["items"][key] = rec
+                writer.mark_dirty(key)
+                encoded_count += 1
 
         finally:
             for pth in finally_cleanup_files:
+                _silent_unlink(pth)
+            shutil.rmtree(streams_root, ignore_errors=True)
+
+    atexit.register(writer.flush_at_exit)
+    previous_sigterm = signal.signal(signal.SIGTERM, _raise_system_exit)
+    try:
+        # Encodes sharing an output name would collide on their .part files, so
+        # only the first of each runs in the pool; repeats follow serially in order.
+        first_of_name: list[int] = []
+        repeats: list[int] = []
+        seen_names: set[str] = set()
+        for i, video in enumerate(videos):
+            stem = sanitize_base(os.path.splitext(os.path.basename(video))[0])
+            name = _lowercase_suffix_str(f"{stem}{args.name_suffix}{OUT_EXT}")
+            (repeats if name in seen_names else first_of_name).append(i)
+            seen_names.add(name)
+        serial = list(range(len(videos)))
+        if args.jobs > 1 and len(first_of_name) > 1:
+            with ThreadPoolExecutor(max_workers=args.jobs) as encoders:
+                encode_futures: list[Future[None]] = []
                 try:
-                    if os.path.exists(pth):
-                        os.remove(pth)
-                except FileNotFoundError:
-                    pass
-            if streams_root.exists():
-                shutil.rmtree(streams_root, ignore_errors=True)
-
-    videos_by_dir: dict[str, list[dict[str, Any]]] = {}
-    for meta in video_metadata:
-        videos_by_dir.setdefault(meta["dir"], []).append(meta)
-
-    asset_renames: dict[str, str] = {}
-    for asset in assets:
-        asset_dir = os.path.abspath(os.path.dirname(asset))
-        asset_base = os.path.basename(asset)
-        for meta in videos_by_dir.get(asset_dir, []):
-            if meta.get("used_original"):
+                    for i in first_of_name:
+                        encode_futures.append(encoders.submit(encode_one, i, videos[i]))
+                    for encode_future in encode_futures:
+                        encode_future.result()
+                except BaseException:
+                    # leaving the pool waits on every running encode; stop
+                    # their children so it returns promptly
+                    children.terminate_all()
+                    raise
+                finally:
+                    for encode_future in encode_futures:
+                        encode_future.cancel()
+            serial = repeats
+        for i in serial:
+            encode_one(i, videos[i])
+
+        # (original, desired) file names of renamed videos per directory,
+        # longest original first: when one video's name contains another's
+        # ("a.mp4" inside "a.mp4.mp4"), an asset carrying the longer name is
+        # matched to that video rather than to the shorter one
+        rename_index: dict[str, list[tuple[str, str]]] = {}
+        for meta in video_metadata:
+            if meta is None or meta.get("used_original") or not meta["ext_changed"]:
                 continue
-            if not meta["ext_changed"]:
-                continue
-            original_name = meta["original"]
-            if original_name and original_name in asset_base:
-                new_base = asset_base.replace(original_name, meta["desired"], 1)
+            if meta["original"]:
+                rename_index.setdefault(meta["dir"], []).append(
+                    (meta["original"], meta["desired"])
+                )
+        for candidates in rename_index.values():
+            candidates.sort(key=lambda pair: len(pair[0]), reverse=True)
+
+        asset_renames: dict[str, str] = {}
+        for asset in assets:
+            asset_dir, asset_base = os.path.split(asset)
+            for original_name, desired in rename_index.get(asset_dir, ()):
+                pos = asset_base.find(original_name)
+                if pos < 0:
+                    continue
+                end = pos + len(original_name)
+                new_base = asset_base[:pos] + desired + asset_base[end:]
                 if new_base != asset_base:
                     asset_renames[asset] = new_base
                 break
 
-    copied_assets = copy_assets(
-        assets,
-        args.output_dir,
-        asset_renames,
-        manifest=manifest,
-        manifest_path=manifest_path,
-    )
-    for asset_src, dest_name in copied_assets:
-        output_by_input[os.path.abspath(asset_src)] = os.path.normpath(dest_name)
-
-    ordered_outputs: list[str] = []
-    for src in all_files:
-        dest_rel = output_by_input.get(os.path.abspath(src))
-        if dest_rel:
-            ordered_outputs.append(dest_rel)
+        copied_assets = copy_assets(
+            assets,
+            args.output_dir,
+            asset_renames,
+            manifest=manifest,
+            manifest_path=manifest_path,
+            stat_cache=stat_cache,
+            src_keys=src_keys,
+        )
+        # keyed by the absolute paths collect_all_files produced; no abspath needed
+        for asset_src, dest_name in copied_assets:
+            output_by_input[asset_src] = os.path.normpath(dest_name)
 
-    if use_constant_quality:
-        save_manifest(manifest, manifest_path)
+        ordered_outputs: list[str] = []
+        for src in all_files:
+            dest_rel = output_by_input.get(src)
+            if dest_rel:
+                ordered_outputs.append(dest_rel)
+
+        writer.flush(compact=True)
+    finally:
+        # drop queued prefetches and any copy no encode consumed, whichever
+        # way the run ended, so nothing is stranded in --stage-dir
+        for pending in prefetched.values():
+            pending.cancel()
+        stager.shutdown(wait=True)
+        for leftover in prefetched:
+            _silent_unlink(stage_path_for(leftover))
+        # persist whatever the exit path left pending, then drop the hooks so
+        # they do not outlive this run
+        writer.flush_at_exit()
+        atexit.unregister(writer.flush_at_exit)
+        signal.signal(signal.SIGTERM, previous_sigterm)
     logging.warning("videos encoded (this run): %d / %d", encoded_count, len(videos))
     if all_videos_done(manifest, args.output_dir):
         logging.warning("all videos complete; manifest retained at %s", manifest_path)
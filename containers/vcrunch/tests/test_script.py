@@ -2,12 +2,17 @@
 
 # mypy: ignore-errors
 
+import errno
 import io
 import json
 import logging
 import os
+import signal
+import struct
 import subprocess
 import sys
+import threading
+import time
 import types
 from datetime import datetime, timezone
 from pathlib import Path
@@ -19,6 +24,12 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 import containers.vcrunch.script as script  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def _reset_probe_state(monkeypatch):
+    # keep the process-wide probe cache from leaking between tests
+    script._probe_cache.clear()
+
+
 def test_parse_size():
     assert script.parse_size("1") == 1
     assert script.parse_size("1k") == 1024
@@ -26,6 +37,25 @@ def test_parse_size():
     assert script.parse_size("2g") == 2 * 1024**3
     assert script.parse_size("3t") == 3 * 1024**4
     assert script.parse_size("1KiB") == 1024
+    assert script.parse_size(" 2MB ") == 2 * 1024**2
+    assert script.parse_size("10b") == 10
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("dvd5", "dvd5"),
+        ("DVD-9", "dvd9"),
+        (" bdr_25 ", "bdr25"),
+        ("CD-R", "cdr700"),
+        ("bdr 50 GB", "bdr50"),
+        ("floppy", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_normalize_media(raw, expected):
+    assert script._normalize_media(raw) == expected
 
 
 def test_kbps_to_bps():
@@ -52,6 +82,14 @@ def test_ffprobe_json(monkeypatch):
     assert script.ffprobe_json(["ffprobe", "file"]) == {"a": 1}
 
 
+def test_ffprobe_json_tolerates_invalid_utf8(monkeypatch):
+    def fake_run(cmd, **kwargs):
+        return types.SimpleNamespace(stdout=b'{"title": "caf\xe9"}', stderr=b"")
+
+    monkeypatch.setattr(script.subprocess, "run", fake_run)
+    assert script.ffprobe_json(["ffprobe", "file"]) == {"title": "caf\ufffd"}
+
+
 def test_parse_time_value_fraction():
     assert script._parse_time_value("1/2") == pytest.approx(0.5)
     assert script._parse_time_value("  ") is None
@@ -80,6 +118,22 @@ def test_collect_frame_timestamps_seconds_fallback(monkeypatch):
     assert any("v:0" in cmd for cmd in calls)
 
 
+def test_collect_frame_timestamps_clamps_non_monotonic(monkeypatch):
+    frames = [
+        {"media_type": "video", "best_effort_timestamp_time": "0.0"},
+        {"media_type": "video", "best_effort_timestamp_time": "0.5"},
+        {"media_type": "video", "best_effort_timestamp_time": "0.25"},
+        {"media_type": "audio", "best_effort_timestamp_time": "0.1"},
+        {"media_type": "video", "pkt_pts_time": "1.0"},
+    ]
+    monkeypatch.setattr(script, "ffprobe_json", lambda cmd: {"frames": frames})
+
+    timestamps = script._collect_frame_timestamps_seconds("input.mkv", 0, "v:0")
+
+    assert isinstance(timestamps, list)
+    assert timestamps == [0.0, 0.5, 0.5, 1.0]
+
+
 def test_dump_streams_data_fallback(monkeypatch, tmp_path):
     metadata = {
         "format": {"format_name": "matroska"},
@@ -135,6 +189,53 @@ def test_dump_streams_data_fallback(monkeypatch, tmp_path):
     assert Path(entry["path"]).with_suffix(".timing.json").exists()
 
 
+def test_dump_streams_reports_video_selection(monkeypatch, tmp_path):
+    metadata = {
+        "format": {"format_name": "mov,mp4,m4a,3gp,3g2,mj2"},
+        "streams": [
+            {
+                "index": 0,
+                "codec_type": "video",
+                "codec_name": "mjpeg",
+                "width": 3000,
+                "height": 3000,
+                "disposition": {"attached_pic": 1},
+            },
+            {
+                "index": 1,
+                "codec_type": "video",
+                "codec_name": "h264",
+                "width": 1920,
+                "height": 1080,
+            },
+        ],
+    }
+    calls = []
+
+    def fake_ffprobe_json(cmd):
+        calls.append(cmd)
+        return metadata
+
+    monkeypatch.setattr(script, "ffprobe_json", fake_ffprobe_json)
+
+    result = script._dump_streams_and_metadata(
+        str(tmp_path / "input.mp4"), tmp_path, False, naming_stem="input"
+    )
+
+    assert result["video_selection"] == (1, "v:1")
+    assert len(calls) == 1
+
+
+def test_json_dumps_matches_stdlib_without_orjson(monkeypatch):
+    payload = {"packets": [0.0, 1.5], "format": {"tags": {"title": "clip"}}}
+    monkeypatch.setattr(script, "_orjson", None)
+    assert script._json_dumps(payload) == json.dumps(payload, indent=2).encode()
+
+
+def test_json_dumps_falls_back_for_non_str_keys():
+    assert json.loads(script._json_dumps({1: "a"})) == {"1": "a"}
+
+
 def test_dump_streams_data_fallback_empty_packets(monkeypatch, tmp_path):
     metadata = {
         "format": {"format_name": "matroska"},
@@ -174,7 +275,9 @@ def test_dump_streams_data_fallback_empty_packets(monkeypatch, tmp_path):
     assert payload == {"packets": []}
 
 
-def test_compute_stream_bitrate_aggregates_packets(monkeypatch):
+def test_compute_stream_bitrate_aggregates_packets(monkeypatch, tmp_path):
+    clip = tmp_path / "clip.mkv"
+    clip.write_bytes(b"clip")
     calls = []
 
     def fake_ffprobe_json(cmd):
@@ -213,12 +316,24 @@ def test_compute_stream_bitrate_aggregates_packets(monkeypatch):
     monkeypatch.setattr(script, "ffprobe_json", fake_ffprobe_json)
     monkeypatch.setattr(script.shutil, "which", lambda name: "/usr/bin/ffprobe")
 
-    metrics = script._compute_stream_bitrate("clip.mkv", "d:0", stream_index=3)
+    metrics = script._compute_stream_bitrate(str(clip), "d:0", stream_index=3)
     assert metrics is not None
     assert metrics["bitrate"] == pytest.approx(8_000.0)
     assert metrics["total_bytes"] == 2000
     assert any("-show_packets" in cmd for cmd in calls)
 
+    other = script._compute_stream_bitrate(str(clip), "d:1", stream_index=4)
+    assert other is not None
+    assert other["total_bytes"] == 2000
+    meta_probes = [cmd for cmd in calls if "-show_packets" not in cmd]
+    assert len(meta_probes) == 1
+
+    # a rewritten file at the same path is probed afresh
+    clip.write_bytes(b"new clip")
+    script._compute_stream_bitrate(str(clip), "d:0", stream_index=3)
+    meta_probes = [cmd for cmd in calls if "-show_packets" not in cmd]
+    assert len(meta_probes) == 2
+
 
 def test_estimate_other_stream_bytes_uses_packet_probe(monkeypatch):
     stream = {"codec_type": "data", "index": 2}
@@ -301,20 +416,8 @@ def test_video_copy_budget_uses_measured_bytes(monkeypatch, tmp_path, caplog):
     src_dir = tmp_path / "src"
     src_dir.mkdir()
     video_path = src_dir / "clip.mp4"
-    video_path.write_bytes(b"input")
-
-    real_getsize = os.path.getsize
-
-    def fake_getsize(path):
-        try:
-            candidate = Path(path)
-        except TypeError:
-            candidate = Path(str(path))
-        if candidate == video_path:
-            return 50_000_000
-        return real_getsize(path)
-
-    monkeypatch.setattr(os.path, "getsize", fake_getsize)
+    with video_path.open("wb") as fh:
+        fh.truncate(50_000_000)
 
     out_dir = tmp_path / "out"
     out_dir.mkdir()
@@ -338,7 +441,7 @@ def test_video_copy_budget_uses_measured_bytes(monkeypatch, tmp_path, caplog):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {"is_video": path.endswith(".mp4"), "duration": 10.0},
+        lambda path, **kwargs: {"is_video": path.endswith(".mp4"), "duration": 10.0},
     )
     monkeypatch.setattr(script, "ffprobe_duration", lambda path: 10.0)
 
@@ -432,10 +535,13 @@ def test_video_copy_budget_uses_measured_bytes(monkeypatch, tmp_path, caplog):
         script, "_apply_source_timestamps", lambda *args, **kwargs: None
     )
 
+    ffmpeg_cmds = []
+
     def fake_run(cmd, **kwargs):
         if not cmd:
             return types.SimpleNamespace(returncode=0, stdout=b"", stderr=b"")
         if cmd[0] == "ffmpeg":
+            ffmpeg_cmds.append(cmd)
             output_path = None
             if "-f" in cmd:
                 for idx, token in enumerate(cmd):
@@ -445,7 +551,9 @@ def test_video_copy_budget_uses_measured_bytes(monkeypatch, tmp_path, caplog):
                 output_path = Path(cmd[-1])
             if output_path is not None:
                 output_path.parent.mkdir(parents=True, exist_ok=True)
-                output_path.write_bytes(b"ffmpeg")
+                # a stream copy can come out slightly larger than the source
+                with output_path.open("wb") as fh:
+                    fh.truncate(60_000_000)
             return types.SimpleNamespace(returncode=0, stdout=b"", stderr=b"")
         if cmd[0] == "mkvmerge":
             out_idx = cmd.index("-o")
@@ -469,6 +577,8 @@ def test_video_copy_budget_uses_measured_bytes(monkeypatch, tmp_path, caplog):
     assert record is not None
     assert "2,500,000" in record.getMessage()
     assert any(spec == "v:0" for _, spec, _ in compute_calls)
+    # every stream is copied, so the original-remux fallback must not run
+    assert len(ffmpeg_cmds) == 1
 
     budget_header = next(
         (
@@ -523,6 +633,26 @@ def test_dump_streams_subtitle_uses_container_data(monkeypatch, tmp_path):
     assert not sidecar_path.exists()
 
 
+def test_mkvmerge_args_orders_tracks_by_type():
+    streams = [
+        script._mkv_track(Path("sub.srt"), {"tags": {"language": "eng"}}, "s"),
+        script._mkv_track(Path("data.bin"), {}, "d"),
+        script._mkv_track(Path("audio2.opus"), {}, "a"),
+        script._mkv_track(Path("video.mkv"), {}, "v"),
+        script._mkv_track(Path("audio1.opus"), {}, "a"),
+    ]
+
+    args, used = script._mkvmerge_args(streams)
+
+    assert used == [
+        Path("video.mkv"),
+        Path("audio2.opus"),
+        Path("audio1.opus"),
+        Path("sub.srt"),
+    ]
+    assert args[-3:] == ["--language", "0:eng", "sub.srt"]
+
+
 def test_packet_sidecar_path_prefers_recorded(tmp_path):
     export_path = tmp_path / "sample.data"
     export_path.write_bytes(b"")
@@ -571,10 +701,14 @@ def test_packet_sidecar_path_missing_file(tmp_path):
 
 
 def test_ffprobe_duration(monkeypatch):
-    monkeypatch.setattr(script, "probe_media_info", lambda path: {"duration": 12.34})
+    monkeypatch.setattr(
+        script, "probe_media_info", lambda path, **kwargs: {"duration": 12.34}
+    )
     assert script.ffprobe_duration("path") == 12.34
 
-    monkeypatch.setattr(script, "probe_media_info", lambda path: {"duration": None})
+    monkeypatch.setattr(
+        script, "probe_media_info", lambda path, **kwargs: {"duration": None}
+    )
     with pytest.raises(ValueError):
         script.ffprobe_duration("path")
 
@@ -584,10 +718,14 @@ def test_get_container_creation_date(monkeypatch):
         "ffprobe",
         "-v",
         "error",
+        "-probesize",
+        "1000000",
+        "-analyzeduration",
+        "1000000",
         "-print_format",
         "json",
         "-show_entries",
-        "format_tags=creation_time,com.apple.quicktime.creationdate",
+        script.FFPROBE_PROBE_ENTRIES,
         "video.mkv",
     ]
 
@@ -605,6 +743,64 @@ def test_get_container_creation_date(monkeypatch):
     assert script.get_container_creation_date("video.mkv") == "2024-09-28T15:42:11Z"
 
 
+def _mp4_box(kind, payload):
+    return struct.pack(">I4s", 8 + len(payload), kind) + payload
+
+
+def _ebml(elem_id, payload):
+    size = len(payload)
+    assert size < 0x7F
+    return elem_id + bytes([0x80 | size]) + payload
+
+
+def test_get_container_creation_date_reads_mp4_mvhd(monkeypatch, tmp_path):
+    created = int(datetime(2024, 9, 28, 15, 42, 11, tzinfo=timezone.utc).timestamp())
+    mvhd = _mp4_box(
+        b"mvhd", b"\x00\x00\x00\x00" + struct.pack(">I", created + 2082844800)
+    )
+    data = (
+        _mp4_box(b"ftyp", b"isom\x00\x00\x02\x00")
+        + _mp4_box(b"mdat", b"\x00" * 4096)
+        + _mp4_box(b"moov", _mp4_box(b"free", b"") + mvhd)
+    )
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(data)
+
+    def fail_probe(cmd):
+        raise AssertionError("ffprobe should not run")
+
+    monkeypatch.setattr(script, "ffprobe_json", fail_probe)
+    assert script.get_container_creation_date(str(path)) == "2024-09-28T15:42:11Z"
+
+
+def test_get_container_creation_date_reads_mkv_date(monkeypatch, tmp_path):
+    created = datetime(2023, 5, 6, 7, 8, 9, tzinfo=timezone.utc)
+    date_ns = int((created.timestamp() - 978307200) * 1_000_000_000)
+    info = _ebml(b"\x44\x61", date_ns.to_bytes(8, "big", signed=True))
+    segment = (
+        b"\x18\x53\x80\x67"
+        + b"\x01\xff\xff\xff\xff\xff\xff\xff"
+        + _ebml(b"\xec", b"\x00" * 4)
+        + _ebml(b"\x15\x49\xa9\x66", _ebml(b"\x2a\xd7\xb1", b"\x0f\x42\x40") + info)
+    )
+    path = tmp_path / "clip.mkv"
+    path.write_bytes(_ebml(b"\x1a\x45\xdf\xa3", b"\x42\x82\x84webm") + segment)
+
+    monkeypatch.setattr(script, "ffprobe_json", lambda cmd: {})
+    assert script.get_container_creation_date(str(path)) == "2023-05-06T07:08:09Z"
+
+
+def test_get_container_creation_date_falls_back_to_ffprobe(monkeypatch, tmp_path):
+    path = tmp_path / "clip.avi"
+    path.write_bytes(b"RIFF\x00\x00\x00\x00AVI ")
+    monkeypatch.setattr(
+        script,
+        "ffprobe_json",
+        lambda cmd: {"format": {"tags": {"creation_time": "2020-01-01T00:00:00Z"}}},
+    )
+    assert script.get_container_creation_date(str(path)) == "2020-01-01T00:00:00Z"
+
+
 def test_get_container_creation_date_missing(monkeypatch):
     monkeypatch.setattr(
         script,
@@ -614,15 +810,76 @@ def test_get_container_creation_date_missing(monkeypatch):
     assert script.get_container_creation_date("video.mkv") is None
 
 
+def test_parse_duration_and_fraction_values():
+    assert script._parse_duration_value("01:02:03.5") == pytest.approx(3723.5)
+    assert script._parse_duration_value("1:02:03") == pytest.approx(3723.0)
+    assert script._parse_duration_value("02:03.5") == pytest.approx(123.5)
+    assert script._parse_duration_value("1:xx:03") is None
+    assert script._parse_duration_value(" 12.5 ") == pytest.approx(12.5)
+    assert script._parse_duration_value("N/A") is None
+    assert script._parse_duration_value("nan") is None
+    assert script._parse_duration_value(-1) is None
+    assert script._parse_fraction("30000/1001") == pytest.approx(29.97, rel=1e-3)
+    assert script._parse_fraction("1/0") is None
+    assert script._parse_fraction(25) == 25.0
+
+
+def test_parsers_cache_string_inputs():
+    script._parse_creation_date.cache_clear()
+    for _ in range(3):
+        assert (
+            script._parse_creation_date("2024-09-28 15:42:11") == "2024-09-28T15:42:11Z"
+        )
+    assert script._parse_creation_date.cache_info().hits == 2
+
+
+def test_probe_full_reuses_result_for_same_file(monkeypatch, tmp_path):
+    src = tmp_path / "clip.mp4"
+    src.write_bytes(b"video")
+    linked = tmp_path / "clip.stage.mp4"
+    os.link(src, linked)
+    calls = []
+
+    def fake_ffprobe_json(cmd):
+        calls.append(cmd[-1])
+        return {"format": {"format_name": "mov"}}
+
+    monkeypatch.setattr(script, "ffprobe_json", fake_ffprobe_json)
+
+    first = script.probe_full(str(src))
+    assert script.probe_full(str(linked)) == first
+    assert calls == [str(src)]
+
+    src.write_bytes(b"changed video")
+    script.probe_full(str(src))
+    assert calls == [str(src), str(src)]
+
+
+def test_probe_media_info_skips_known_non_video_extensions(monkeypatch):
+    def fail(cmd):
+        raise AssertionError("ffprobe should not run")
+
+    monkeypatch.setattr(script, "ffprobe_json", fail)
+    assert script.probe_media_info("notes.TXT") == {
+        "is_video": False,
+        "duration": None,
+    }
+    assert script.probe_media_info("cover.jpg")["is_video"] is False
+
+
 def test_probe_media_info_uses_stream_duration(monkeypatch):
     expected = [
         "ffprobe",
         "-v",
         "error",
+        "-probesize",
+        "1000000",
+        "-analyzeduration",
+        "1000000",
         "-print_format",
         "json",
-        "-show_streams",
-        "-show_format",
+        "-show_entries",
+        script.FFPROBE_PROBE_ENTRIES,
         "path",
     ]
 
@@ -644,6 +901,46 @@ def test_probe_media_info_uses_stream_duration(monkeypatch):
     assert info["duration"] == pytest.approx(12.5)
 
 
+def test_probe_media_info_includes_creation_date(monkeypatch):
+    monkeypatch.setattr(
+        script,
+        "ffprobe_json",
+        lambda cmd: {
+            "format": {
+                "format_name": "mov,mp4",
+                "tags": {"com.apple.quicktime.creationdate": "2024-01-02 03:04:05"},
+            },
+            "streams": [{"codec_type": "video", "duration": "3"}],
+        },
+    )
+    info = script.probe_media_info("clip.mov")
+    assert info["is_video"] is True
+    assert info["creation_date"] == "2024-01-02T03:04:05Z"
+
+
+def test_find_start_timecode_uses_single_probe(monkeypatch):
+    calls = []
+
+    def fake_ffprobe_json(cmd):
+        calls.append(cmd)
+        return {
+            "format": {"tags": {"timecode": "02:00:00:00"}},
+            "streams": [
+                {"codec_type": "video", "tags": {"timecode": "03:00:00:00"}},
+                {"codec_type": "data", "tags": {"timecode": "01:00:00:00"}},
+            ],
+        }
+
+    monkeypatch.setattr(script, "ffprobe_json", fake_ffprobe_json)
+    assert script.find_start_timecode("clip.mov") == "01:00:00:00"
+    assert len(calls) == 1
+
+
+def test_find_start_timecode_defaults(monkeypatch):
+    monkeypatch.setattr(script, "ffprobe_json", lambda cmd: {"streams": []})
+    assert script.find_start_timecode("clip.mov") == "00:00:00:00"
+
+
 def test_probe_media_info_zero_duration_is_still(monkeypatch):
     def fake_ffprobe_json(cmd):
         return {
@@ -666,10 +963,14 @@ def test_probe_media_info_detects_image_container(monkeypatch):
         "ffprobe",
         "-v",
         "error",
+        "-probesize",
+        "1000000",
+        "-analyzeduration",
+        "1000000",
         "-print_format",
         "json",
-        "-show_streams",
-        "-show_format",
+        "-show_entries",
+        script.FFPROBE_PROBE_ENTRIES,
         "still.png",
     ]
 
@@ -690,6 +991,19 @@ def test_probe_media_info_detects_image_container(monkeypatch):
     assert info == {"is_video": False, "duration": None}
 
 
+@pytest.mark.parametrize(
+    "format_name, expected",
+    [
+        ("image2", True),
+        ("mov,mp4,m4a,3gp,3g2,mj2", False),
+        ("matroska, png_pipe", True),
+        ("", False),
+    ],
+)
+def test_is_image_container(format_name, expected):
+    assert script._is_image_container(format_name) is expected
+
+
 def test_probe_media_info_attached_picture(monkeypatch):
     def fake_ffprobe_json(cmd):
         return {
@@ -731,10 +1045,14 @@ def test_is_valid_media(monkeypatch):
 
 
 def test_has_video_stream(monkeypatch):
-    monkeypatch.setattr(script, "probe_media_info", lambda path: {"is_video": True})
+    monkeypatch.setattr(
+        script, "probe_media_info", lambda path, **kwargs: {"is_video": True}
+    )
     assert script.has_video_stream("path") is True
 
-    monkeypatch.setattr(script, "probe_media_info", lambda path: {"is_video": False})
+    monkeypatch.setattr(
+        script, "probe_media_info", lambda path, **kwargs: {"is_video": False}
+    )
     assert script.has_video_stream("path") is False
 
 
@@ -794,6 +1112,267 @@ def test_copy_assets_skips_done(tmp_path):
     assert results == [(str(src), "asset.bin")]
 
 
+def test_copy_assets_batches_manifest_saves(monkeypatch, tmp_path):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    assets = []
+    for name in ("a.bin", "b.bin", "c.bin"):
+        path = tmp_path / name
+        path.write_text(name)
+        assets.append(str(path))
+    manifest_path = tmp_path / "manifest.json"
+    manifest = {"items": {}, "probes": {}}
+    saves = []
+    real_save = script.save_manifest
+    monkeypatch.setattr(
+        script,
+        "save_manifest",
+        lambda m, p: (saves.append(p), real_save(m, p)),
+    )
+
+    script.copy_assets(
+        assets, str(out_dir), manifest=manifest, manifest_path=str(manifest_path)
+    )
+
+    assert saves == [str(manifest_path)]
+    saved = json.loads(manifest_path.read_text())
+    assert [rec["status"] for rec in saved["items"].values()] == ["done"] * 3
+
+
+def test_fast_copy_preserves_content_and_stat(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"x" * 70_000)
+    os.chmod(src, 0o640)
+    os.utime(src, (1_500_000_000, 1_500_000_000))
+    dst = tmp_path / "dst.bin"
+
+    script._fast_copy(str(src), str(dst))
+
+    assert dst.read_bytes() == src.read_bytes()
+    assert dst.stat().st_mode & 0o777 == 0o640
+    assert int(dst.stat().st_mtime) == 1_500_000_000
+
+
+def test_fast_copy_falls_back_to_userspace(monkeypatch, tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"payload")
+    dst = tmp_path / "dst.bin"
+
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(script, "_fcntl", None)
+    monkeypatch.setattr(script.os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(script.os, "sendfile", unsupported)
+
+    script._fast_copy(str(src), str(dst))
+
+    assert dst.read_bytes() == b"payload"
+
+
+def test_fast_copy_treats_immediate_eof_as_unsupported(monkeypatch, tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"payload")
+    dst = tmp_path / "dst.bin"
+    monkeypatch.setattr(script, "_fcntl", None)
+    monkeypatch.setattr(script.os, "copy_file_range", lambda *a: 0, raising=False)
+    monkeypatch.setattr(script.os, "sendfile", lambda *a: 0)
+
+    script._fast_copy(str(src), str(dst))
+
+    assert dst.read_bytes() == b"payload"
+
+
+def test_fast_copy_reraises_after_partial_copy(monkeypatch, tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"payload")
+    calls = []
+
+    def flaky(in_fd, out_fd, count):
+        calls.append(count)
+        if len(calls) == 1:
+            return 3
+        raise OSError(errno.ENOSPC, "disk full")
+
+    monkeypatch.setattr(script, "_fcntl", None)
+    monkeypatch.setattr(script.os, "copy_file_range", flaky, raising=False)
+
+    with pytest.raises(OSError):
+        script._fast_copy(str(src), str(tmp_path / "dst.bin"))
+
+
+def test_copy_assets_sets_timestamps_once(monkeypatch, tmp_path):
+    src = tmp_path / "notes.txt"
+    src.write_text("notes")
+    os.utime(src, (1_500_000_000, 1_500_000_000))
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    utimes = []
+    real_utime = os.utime
+
+    def counting_utime(path, *args, **kwargs):
+        utimes.append(path)
+        return real_utime(path, *args, **kwargs)
+
+    monkeypatch.setattr(script.os, "utime", counting_utime)
+
+    script.copy_assets([str(src)], str(out_dir))
+
+    assert len(utimes) == 1
+    assert int((out_dir / "notes.txt").stat().st_mtime) == 1_500_000_000
+
+
+def _no_hard_links(monkeypatch):
+    def cross_device(a, b):
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(script.os, "link", cross_device)
+
+
+def test_stage_source_hard_links_on_same_filesystem(tmp_path):
+    src = tmp_path / "clip.mp4"
+    src.write_bytes(b"video")
+    stage = tmp_path / "clip.abcd.mp4"
+    stage.write_bytes(b"stale")
+
+    script._stage_source(str(src), str(stage))
+
+    assert os.path.samefile(src, stage)
+    assert src.read_bytes() == b"video"
+
+
+def test_stage_source_skips_stat_copy(monkeypatch, tmp_path):
+    _no_hard_links(monkeypatch)
+    src = tmp_path / "clip.mp4"
+    src.write_bytes(b"video")
+    os.utime(src, (1_500_000_000, 1_500_000_000))
+    stage = tmp_path / "clip.abcd.mp4"
+    stage.write_bytes(b"stale")
+
+    script._stage_source(str(src), str(stage))
+
+    assert stage.read_bytes() == b"video"
+    assert int(stage.stat().st_mtime) != 1_500_000_000
+
+
+def test_stage_source_hints_page_cache(monkeypatch, tmp_path):
+    _no_hard_links(monkeypatch)
+    src = tmp_path / "clip.mp4"
+    src.write_bytes(b"video")
+    advice = []
+    monkeypatch.setattr(
+        script.os,
+        "posix_fadvise",
+        lambda fd, offset, length, adv: advice.append(adv),
+        raising=False,
+    )
+    monkeypatch.setattr(script.os, "POSIX_FADV_SEQUENTIAL", 2, raising=False)
+    monkeypatch.setattr(script.os, "POSIX_FADV_DONTNEED", 4, raising=False)
+
+    script._stage_source(str(src), str(tmp_path / "clip.abcd.mp4"))
+
+    assert advice == [2, 4]
+
+
+def test_fast_copy_prefers_reflink(monkeypatch, tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"payload")
+    dst = tmp_path / "dst.bin"
+    ioctls = []
+
+    def fake_ioctl(fd, request, arg):
+        ioctls.append(request)
+        os.write(fd, b"payload")
+
+    def unexpected(*args):
+        raise AssertionError("kernel copy should not run after a reflink")
+
+    monkeypatch.setattr(script, "_fcntl", types.SimpleNamespace(ioctl=fake_ioctl))
+    monkeypatch.setattr(script.os, "copy_file_range", unexpected, raising=False)
+    monkeypatch.setattr(script.os, "sendfile", unexpected)
+
+    script._fast_copy(str(src), str(dst))
+
+    assert ioctls == [script._FICLONE]
+    assert dst.read_bytes() == b"payload"
+
+
+def test_rename_into_place_renames_on_same_filesystem(tmp_path):
+    src = tmp_path / "stage.mkv"
+    src.write_bytes(b"encoded")
+    inode = src.stat().st_ino
+    dst = tmp_path / "out.mkv"
+
+    assert script._rename_into_place(str(src), str(dst)) is True
+
+    assert dst.read_bytes() == b"encoded"
+    assert dst.stat().st_ino == inode
+    assert not src.exists()
+
+
+def test_rename_into_place_reports_cross_device(monkeypatch, tmp_path):
+    src = tmp_path / "stage.mkv"
+    src.write_bytes(b"encoded")
+    dst = tmp_path / "out.mkv"
+
+    def cross_device(a, b):
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(script.os, "replace", cross_device)
+
+    assert script._rename_into_place(str(src), str(dst)) is False
+    assert src.read_bytes() == b"encoded"
+    assert not dst.exists()
+
+
+def test_staged_file_names_lists_files_only(tmp_path):
+    (tmp_path / "video.stream.h264.mkv").write_bytes(b"v")
+    (tmp_path / "nested").mkdir()
+
+    assert script._staged_file_names(tmp_path) == {"video.stream.h264.mkv"}
+    assert script._staged_file_names(tmp_path / "missing") == set()
+
+
+def test_copy_assets_overlapping_destinations_keep_last(tmp_path):
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    assets = []
+    for folder in ("one", "two", "three"):
+        (tmp_path / folder).mkdir()
+        path = tmp_path / folder / "notes.txt"
+        path.write_text(folder)
+        assets.append(str(path))
+    other = tmp_path / "one" / "other.txt"
+    other.write_text("other")
+    assets.append(str(other))
+
+    results = script.copy_assets(assets, str(out_dir))
+
+    assert (out_dir / "notes.txt").read_text() == "three"
+    assert (out_dir / "other.txt").read_text() == "other"
+    assert sorted(results) == sorted([(path, Path(path).name) for path in assets])
+
+
+def test_copy_assets_uses_stat_cache(tmp_path):
+    src = tmp_path / "asset.bin"
+    src.write_text("payload")
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    cached = os.stat_result((0o100644, 0, 0, 1, 0, 0, 7, 1, 1_600_000_000, 1))
+    manifest = {"items": {}, "probes": {}}
+
+    script.copy_assets(
+        [str(src)],
+        str(out_dir),
+        manifest=manifest,
+        manifest_path=str(tmp_path / "manifest.json"),
+        stat_cache={str(src): cached},
+    )
+
+    assert list(manifest["items"]) == [script.src_key(str(src), cached)]
+    assert (out_dir / "asset.bin").read_text() == "payload"
+
+
 def test_copy_assets_preserves_metadata(tmp_path):
     src = tmp_path / "asset.bin"
     src.write_text("content")
@@ -892,30 +1471,103 @@ def test_run_failure(monkeypatch):
     assert exc.value.code == 1
 
 
-def test_main_keeps_original_name_when_larger(monkeypatch, tmp_path):
-    src = tmp_path / "video.mp4"
-    src.write_bytes(b"source-bytes")
-    out_dir = tmp_path / "out"
-    stage_dir = tmp_path / "stage"
+def _run_main_until_dump(monkeypatch, tmp_path, extra_argv):
+    # main() on two 30 MB videos against a 40M target, so they need encoding;
+    # stops at the first stream dump, after probing and budgeting
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    for name in ("a.mp4", "b.mp4"):
+        with (src_dir / name).open("wb") as fh:
+            fh.truncate(30_000_000)
+    argv = [
+        "script.py",
+        "--input",
+        str(src_dir),
+        "--target-size",
+        "40M",
+        "--output-dir",
+        str(tmp_path / "out"),
+        *extra_argv,
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    def failing_dump(src, dest_dir, verbose, **kwargs):
+        raise RuntimeError("stop before encoding")
+
+    monkeypatch.setattr(script, "_dump_streams_and_metadata", failing_dump)
+    script.main()
+
+
+def _only_when_overlapping(result):
+    # fake probe that only returns once two calls are in flight at the same
+    # time; also returns the names of the paths it was called with
+    both_running = threading.Barrier(2, timeout=5)
+    seen = []
+
+    def fake(path, **kwargs):
+        both_running.wait()
+        seen.append(Path(path).name)
+        return result
+
+    return fake, seen
 
-    monkeypatch.setattr(
-        script.sys,
-        "argv",
-        [
-            "vcrunch",
-            "--input",
-            str(src),
-            "--output-dir",
-            str(out_dir),
-            "--stage-dir",
-            str(stage_dir),
-        ],
-    )
 
+def test_budget_stream_layouts_probe_concurrently(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {"is_video": True, "duration": 10.0},
+        lambda path, **kwargs: {"is_video": True, "duration": 10.0},
+    )
+    fake_layout, inspected = _only_when_overlapping([])
+    monkeypatch.setattr(script, "_probe_stream_infos_only", fake_layout)
+
+    _run_main_until_dump(monkeypatch, tmp_path, ["--probe-workers", "2"])
+
+    assert sorted(inspected) == ["a.mp4", "b.mp4"]
+
+
+def test_missing_durations_backfill_concurrently(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        script, "probe_media_info", lambda path, **kwargs: {"is_video": True}
+    )
+    fake_duration, measured = _only_when_overlapping(10.0)
+    monkeypatch.setattr(script, "ffprobe_duration", fake_duration)
+    monkeypatch.setattr(script, "_probe_stream_infos_only", lambda path: [])
+
+    _run_main_until_dump(monkeypatch, tmp_path, ["--probe-workers", "2"])
+
+    assert sorted(measured) == ["a.mp4", "b.mp4"]
+    manifest = json.loads((tmp_path / "out" / script.MANIFEST_NAME).read_text())
+    assert [entry["duration"] for entry in manifest["probes"].values()] == [
+        10.0,
+        10.0,
+    ]
+
+
+def test_main_keeps_original_name_when_larger(monkeypatch, tmp_path):
+    src = tmp_path / "video.mp4"
+    src.write_bytes(b"source-bytes")
+    out_dir = tmp_path / "out"
+    stage_dir = tmp_path / "stage"
+
+    monkeypatch.setattr(
+        script.sys,
+        "argv",
+        [
+            "vcrunch",
+            "--input",
+            str(src),
+            "--output-dir",
+            str(out_dir),
+            "--stage-dir",
+            str(stage_dir),
+        ],
+    )
+
+    monkeypatch.setattr(
+        script,
+        "probe_media_info",
+        lambda path, **kwargs: {"is_video": True, "duration": 10.0},
     )
     monkeypatch.setattr(script, "ffprobe_duration", lambda path: 10.0)
     monkeypatch.setattr(script, "find_start_timecode", lambda path: "00:00:00:00")
@@ -990,6 +1642,38 @@ def test_collect_all_files(tmp_path):
     assert result == expected
 
 
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "*.mp4",
+        "clip?.mp4",
+        "[ab]*",
+        "*",
+        "*.MP4",
+        "sub/*.mp4",
+        "clip*",
+        "*/clip?.mp4",
+        "*/*/clip1.mp4",
+        "sub/a.*",
+    ],
+)
+def test_collect_all_files_pattern_matches_purepath(tmp_path, pattern):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    for name in ("clip1.mp4", "clip22.mp4", "a.txt", "b.MP4"):
+        (sub / name).write_text(name)
+    (tmp_path / "top.mp4").write_text("top")
+
+    everything = script.collect_all_files([str(tmp_path)], None)
+    result = script.collect_all_files([str(tmp_path)], pattern)
+
+    assert result == [p for p in everything if Path(p).match(pattern)]
+    absolute = str(tmp_path / pattern)
+    assert script.collect_all_files([str(tmp_path)], absolute) == [
+        p for p in everything if Path(p).match(absolute)
+    ]
+
+
 def test_collect_all_files_skips_dot_underscore(tmp_path):
     (tmp_path / "._video.mp4").write_text("meta")
     (tmp_path / "video.mp4").write_text("data")
@@ -998,6 +1682,42 @@ def test_collect_all_files_skips_dot_underscore(tmp_path):
     assert str(tmp_path / "._video.mp4") not in result
 
 
+def test_collect_all_files_returns_normalized_absolute_paths(monkeypatch, tmp_path):
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / "clip.mp4").write_text("v")
+    monkeypatch.chdir(tmp_path)
+
+    result = script.collect_all_files(["./sub/../sub", "sub/clip.mp4"], None)
+
+    assert result == [str(sub / "clip.mp4")]
+
+
+def test_collect_all_files_symlinks_and_ignored_dirs(tmp_path):
+    root = tmp_path / "root"
+    root.mkdir()
+    (root / "clip.mp4").write_text("v")
+    other = tmp_path / "other"
+    other.mkdir()
+    (other / "outside.mp4").write_text("o")
+    (root / "linked_dir").symlink_to(other, target_is_directory=True)
+    (root / "linked.mp4").symlink_to(other / "outside.mp4")
+    hidden = root / "._meta"
+    hidden.mkdir()
+    (hidden / "x.mp4").write_text("x")
+
+    result = script.collect_all_files([str(root)], None)
+
+    assert result == [str(root / "clip.mp4"), str(root / "linked.mp4")]
+
+
+def test_short_hash_is_stable_and_short():
+    value = script._short_hash("/in/clip.mp4")
+    assert value == script._short_hash("/in/clip.mp4")
+    assert len(value) == 8
+    assert value != script._short_hash("/in/clip2.mp4")
+
+
 def test_read_paths_from_file(tmp_path):
     f = tmp_path / "paths.txt"
     f.write_text("a\n\n b \n")
@@ -1038,6 +1758,21 @@ def test_load_manifest_existing(monkeypatch, tmp_path):
     assert script.load_manifest(str(path)) == {"foo": 1, "items": {}, "probes": {}}
 
 
+def test_load_manifest_drops_malformed_entries(tmp_path):
+    path = tmp_path / "m.json"
+    path.write_text(
+        json.dumps(
+            {
+                "items": {"a": {"status": "done"}, "b": "oops", "c": None},
+                "probes": {"p": {"is_video": True}, "q": [1]},
+            }
+        )
+    )
+    m = script.load_manifest(str(path))
+    assert m["items"] == {"a": {"status": "done"}}
+    assert m["probes"] == {"p": {"is_video": True}}
+
+
 def test_load_manifest_invalid(monkeypatch, tmp_path):
     monkeypatch.setattr(script, "now_utc_iso", lambda: "TS")
     path = tmp_path / "m.json"
@@ -1050,6 +1785,105 @@ def test_load_manifest_invalid(monkeypatch, tmp_path):
     }
 
 
+def test_manifest_writer_debounces_saves(monkeypatch, tmp_path):
+    saves = []
+    monkeypatch.setattr(
+        script, "save_manifest", lambda m, path: saves.append(dict(m["items"]))
+    )
+    now = [100.0]
+    monkeypatch.setattr(script.time, "monotonic", lambda: now[0])
+    manifest = {"items": {}}
+    writer = script.ManifestWriter(manifest, str(tmp_path / "m.json"), interval=0.5)
+
+    manifest["items"]["a"] = {"status": "pending"}
+    writer.mark_dirty("a")
+    manifest["items"]["b"] = {"status": "pending"}
+    writer.mark_dirty("b")
+    now[0] += 0.1
+    manifest["items"]["c"] = {"status": "pending"}
+    writer.mark_dirty("c")
+    assert len(saves) == 1
+
+    writer.flush()
+    assert saves[-1].keys() == {"a", "b", "c"}
+    writer.flush()
+    assert len(saves) == 2
+
+    now[0] += 1.0
+    writer.mark_dirty("a")
+    assert len(saves) == 3
+
+
+def test_manifest_writer_appends_item_log(monkeypatch, tmp_path):
+    monkeypatch.setattr(script, "now_utc_iso", lambda: "TS")
+    path = tmp_path / "m.json"
+    log_path = tmp_path / "m.json.log"
+    manifest = script.load_manifest(str(path))
+    manifest["items"]["a"] = {"status": "pending"}
+    script.save_manifest(manifest, str(path))
+    snapshot = path.read_bytes()
+    writer = script.ManifestWriter(manifest, str(path), interval=0.0)
+
+    manifest["items"]["a"] = {"status": "encoding_started"}
+    writer.mark_dirty("a")
+    manifest["items"]["b"] = {"status": "pending"}
+    writer.mark_dirty("b")
+
+    assert path.read_bytes() == snapshot
+    lines = log_path.read_bytes().splitlines()
+    assert [json.loads(line)["key"] for line in lines] == ["a", "b"]
+    assert script.load_manifest(str(path))["items"] == manifest["items"]
+
+    writer.flush(compact=True)
+    assert not log_path.exists()
+    assert json.loads(path.read_text())["items"] == manifest["items"]
+
+
+def test_load_manifest_skips_log_from_older_snapshot(monkeypatch, tmp_path):
+    path = tmp_path / "m.json"
+    manifest = script.load_manifest(str(path))
+    manifest["items"]["a"] = {"status": "pending"}
+    script.save_manifest(manifest, str(path))
+    manifest["items"]["a"] = {"status": "encoding_started"}
+    script.append_manifest_items(manifest, str(path), ["a"])
+
+    # crash after the new snapshot landed but before the log was removed
+    monkeypatch.setattr(script, "_silent_unlink", lambda path: None)
+    manifest["items"]["a"] = {"status": "done"}
+    script.save_manifest(manifest, str(path))
+
+    assert (tmp_path / "m.json.log").exists()
+    assert script.load_manifest(str(path))["items"] == {"a": {"status": "done"}}
+
+
+def test_manifest_writer_sees_saves_made_elsewhere(tmp_path):
+    path = tmp_path / "m.json"
+    manifest = script.load_manifest(str(path))
+    writer = script.ManifestWriter(manifest, str(path), interval=0.0)
+    manifest["items"]["a"] = {"status": "pending"}
+    script.save_manifest(manifest, str(path))
+    snapshot = path.read_bytes()
+
+    manifest["items"]["a"] = {"status": "encoding_started"}
+    writer.mark_dirty("a")
+
+    assert path.read_bytes() == snapshot
+    assert (tmp_path / "m.json.log").exists()
+
+
+def test_load_manifest_ignores_torn_log_line(tmp_path):
+    path = tmp_path / "m.json"
+    path.write_text(json.dumps({"items": {"a": {"status": "pending"}}}))
+    (tmp_path / "m.json.log").write_bytes(
+        b'{"key":"a","item":{"status":"done"},"updated":"T1"}\n{"key":"b","ite'
+    )
+
+    m = script.load_manifest(str(path))
+
+    assert m["items"] == {"a": {"status": "done"}}
+    assert m["updated"] == "T1"
+
+
 def test_save_manifest(monkeypatch, tmp_path):
     monkeypatch.setattr(script, "now_utc_iso", lambda: "TS2")
     path = tmp_path / "m.json"
@@ -1060,6 +1894,371 @@ def test_save_manifest(monkeypatch, tmp_path):
     assert data["updated"] == "TS2"
 
 
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_manifest_roundtrip(monkeypatch, tmp_path, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(script, "_orjson", None)
+    path = tmp_path / "m.json"
+    manifest = {
+        "version": 1,
+        "items": {"k": {"src": "/in/caf\u00e9.mp4", "status": "done"}},
+        "probes": {"k": {"is_video": True, "duration": 1.5}},
+    }
+    script.save_manifest(manifest, str(path))
+    raw = path.read_bytes()
+    assert raw.endswith(b"}\n")
+    assert script.load_manifest(str(path)) == manifest
+
+
+def _stub_cq_encodes(monkeypatch, tmp_path, sources, extra_argv=()):
+    # main() at --constant-quality 30 over the given {name: bytes} videos,
+    # each a single h264 stream; returns (out_dir, stage_dir). ffmpeg and
+    # mkvmerge are left for the test to fake.
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    for name, data in sources.items():
+        (src_dir / name).write_bytes(data)
+    out_dir = tmp_path / "out"
+    stage_dir = tmp_path / "stage"
+    stage_dir.mkdir()
+    argv = [
+        "script.py",
+        "--input",
+        str(src_dir),
+        "--constant-quality",
+        "30",
+        "--output-dir",
+        str(out_dir),
+        "--stage-dir",
+        str(stage_dir),
+        *extra_argv,
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(
+        script,
+        "probe_media_info",
+        lambda path, **kwargs: {"is_video": True, "duration": 10.0},
+    )
+
+    def fake_dump(src, dest_dir, verbose, **kwargs):
+        dest_dir.mkdir(parents=True, exist_ok=True)
+        return {
+            "exports": [],
+            "attachments": [],
+            "metadata_path": None,
+            "container_tags": {},
+            "stream_infos": [
+                {
+                    "index": 0,
+                    "stream": {"codec_type": "video", "codec_name": "h264"},
+                    "stype": "v",
+                    "mkv_ok": True,
+                    "spec": "v:0",
+                }
+            ],
+            "video_selection": (0, "v:0"),
+        }
+
+    monkeypatch.setattr(script, "_dump_streams_and_metadata", fake_dump)
+    monkeypatch.setattr(script, "_probe_stream_infos_only", lambda path: [])
+    monkeypatch.setattr(script, "get_container_creation_date", lambda path: None)
+    monkeypatch.setattr(script, "is_valid_media", lambda path: True)
+    monkeypatch.setattr(
+        script, "_apply_source_timestamps", lambda *args, **kwargs: None
+    )
+    return out_dir, stage_dir
+
+
+def _fake_tool_run(cmd, **kwargs):
+    # ffmpeg writes its last argument, mkvmerge its -o target
+    if cmd[0] == "ffmpeg":
+        Path(cmd[-1]).write_bytes(b"encoded")
+    elif cmd[0] == "mkvmerge":
+        Path(cmd[2]).write_bytes(b"muxed")
+    return types.SimpleNamespace(returncode=0, stdout=b"", stderr=b"")
+
+
+def test_main_prefetches_next_video_into_staging(monkeypatch, tmp_path):
+    names = ("a.mp4", "b.mp4", "c.mp4")
+    out_dir, stage_dir = _stub_cq_encodes(
+        monkeypatch, tmp_path, {name: name.encode() for name in names}
+    )
+    stagers = {}
+    real_stage = script._stage_source
+
+    def tracking_stage(src, stage_src):
+        stagers[Path(src).name] = threading.get_ident()
+        real_stage(src, stage_src)
+
+    monkeypatch.setattr(script, "_stage_source", tracking_stage)
+    monkeypatch.setattr(script.subprocess, "run", _fake_tool_run)
+
+    script.main()
+
+    main_thread = threading.get_ident()
+    assert stagers["a.mp4"] == main_thread
+    assert stagers["b.mp4"] != main_thread
+    assert stagers["c.mp4"] != main_thread
+    for name in ("a", "b", "c"):
+        assert (out_dir / f"{name}.mkv").read_bytes() == b"muxed"
+    assert list(stage_dir.iterdir()) == []
+
+
+def test_main_removes_prefetched_copy_when_encode_raises(monkeypatch, tmp_path):
+    _out_dir, stage_dir = _stub_cq_encodes(
+        monkeypatch, tmp_path, {"a.mp4": b"a", "b.mp4": b"b"}
+    )
+    staged = threading.Event()
+    real_stage = script._stage_source
+
+    def tracking_stage(src, stage_src):
+        real_stage(src, stage_src)
+        if Path(src).name == "b.mp4":
+            staged.set()
+
+    def interrupted_run(cmd, **kwargs):
+        if cmd[0] == "ffmpeg":
+            # the next video is fully copied before the run is cut short
+            assert staged.wait(5)
+            raise KeyboardInterrupt
+        return _fake_tool_run(cmd, **kwargs)
+
+    monkeypatch.setattr(script, "_stage_source", tracking_stage)
+    monkeypatch.setattr(script.subprocess, "run", interrupted_run)
+
+    with pytest.raises(KeyboardInterrupt):
+        script.main()
+
+    assert [p for p in stage_dir.rglob("*") if p.is_file()] == []
+
+
+def test_main_persists_corrected_output_of_done_video(monkeypatch, tmp_path):
+    out_dir, _stage_dir = _stub_cq_encodes(monkeypatch, tmp_path, {"a.mp4": b"a"})
+    src = tmp_path / "src" / "a.mp4"
+    key = script.src_key(str(src), src.stat())
+    out_dir.mkdir()
+    (out_dir / "a.mkv").write_bytes(b"muxed")
+    manifest_path = out_dir / script.MANIFEST_NAME
+    manifest = script.load_manifest(str(manifest_path))
+    manifest["items"][key] = {
+        "type": "video",
+        "src": str(src),
+        "output": "a.MKV",
+        "status": "done",
+    }
+    script.save_manifest(manifest, str(manifest_path))
+    monkeypatch.setattr(script.subprocess, "run", _fake_tool_run)
+
+    script.main()
+
+    rec = script.load_manifest(str(manifest_path))["items"][key]
+    assert rec["status"] == "done"
+    assert rec["output"] == "a.mkv"
+
+
+def test_main_renames_asset_after_longest_matching_video(monkeypatch, tmp_path):
+    out_dir, _stage_dir = _stub_cq_encodes(
+        monkeypatch,
+        tmp_path,
+        # sources larger than the fake encode, so the encodes are kept
+        {"a.mp4": b"a" * 64, "a.mp4.mp4": b"b" * 64, "a.mp4.mp4.srt": b"subs"},
+    )
+    monkeypatch.setattr(
+        script,
+        "probe_media_info",
+        lambda path, **kwargs: {
+            "is_video": path.endswith(".mp4"),
+            "duration": 10.0 if path.endswith(".mp4") else None,
+        },
+    )
+    monkeypatch.setattr(script.subprocess, "run", _fake_tool_run)
+
+    script.main()
+
+    assert sorted(p.name for p in out_dir.iterdir() if not p.name.startswith(".")) == [
+        "a.mkv",
+        "a.mp4.mkv",
+        "a.mp4.mkv.srt",
+    ]
+
+
+def _popen_running(fake_run):
+    # Popen stand-in for --jobs encodes; runs fake_run when waited on
+    class FakePopen:
+        def __init__(self, cmd, **kwargs):
+            self.cmd = cmd
+            self.kwargs = kwargs
+
+        def wait(self):
+            return fake_run(self.cmd, **self.kwargs).returncode
+
+        def terminate(self):
+            raise AssertionError("unexpected terminate")
+
+    return FakePopen
+
+
+def test_main_encodes_videos_concurrently_with_jobs(monkeypatch, tmp_path):
+    names = ("a.mp4", "b.mp4", "c.mp4")
+    out_dir, _ = _stub_cq_encodes(
+        monkeypatch, tmp_path, {name: name.encode() for name in names}, ["--jobs", "2"]
+    )
+    lock = threading.Lock()
+    both_running = threading.Barrier(2, timeout=5)
+    encoders = []
+    ffmpeg_cmds = []
+
+    def fake_run(cmd, **kwargs):
+        if cmd[0] == "ffmpeg":
+            with lock:
+                encoders.append(threading.get_ident())
+                ffmpeg_cmds.append(cmd)
+                first_two = len(encoders) <= 2
+            if first_two:
+                # the first two encodes only finish if they overlap
+                both_running.wait()
+        return _fake_tool_run(cmd, **kwargs)
+
+    monkeypatch.setattr(script.subprocess, "Popen", _popen_running(fake_run))
+    monkeypatch.setattr(script.os, "cpu_count", lambda: 8)
+
+    script.main()
+
+    assert len(set(encoders[:2])) == 2
+    # 8 CPUs shared by 2 concurrent encodes
+    for cmd in ffmpeg_cmds:
+        assert cmd[cmd.index("-threads") + 1] == "4"
+        assert cmd[cmd.index("-filter_threads") + 1] == "4"
+    for name in ("a", "b", "c"):
+        assert (out_dir / f"{name}.mkv").read_bytes() == b"muxed"
+    manifest = json.loads((out_dir / ".job.json").read_text())
+    statuses = [item["status"] for item in manifest["items"].values()]
+    assert statuses == ["done", "done", "done"]
+
+
+def test_main_terminates_running_encodes_on_exit_with_jobs(monkeypatch, tmp_path):
+    out_dir, _ = _stub_cq_encodes(
+        monkeypatch, tmp_path, {"a.mp4": b"a", "b.mp4": b"b"}, ["--jobs", "2"]
+    )
+    started = threading.Semaphore(0)
+    terminated = []
+
+    class BlockedEncode:
+        # an encode that only ends when terminated
+        def __init__(self, cmd, **kwargs):
+            self.stopped = threading.Event()
+            started.release()
+
+        def wait(self):
+            assert self.stopped.wait(timeout=5), "encode was never terminated"
+            return -15
+
+        def terminate(self):
+            terminated.append(self)
+            self.stopped.set()
+
+    def main_waits_on_encodes():
+        frame = sys._current_frames().get(threading.main_thread().ident)
+        while frame is not None:
+            if frame.f_code.co_name == "result":
+                return True
+            frame = frame.f_back
+        return False
+
+    def sigterm_once_both_encode():
+        for _ in range(2):
+            assert started.acquire(timeout=5)
+        # signal only once every encode is submitted and main sits in result()
+        deadline = time.monotonic() + 5
+        while not main_waits_on_encodes() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        os.kill(os.getpid(), signal.SIGTERM)
+
+    monkeypatch.setattr(script.subprocess, "Popen", BlockedEncode)
+    threading.Thread(target=sigterm_once_both_encode, daemon=True).start()
+
+    with pytest.raises(SystemExit) as exc:
+        script.main()
+
+    assert exc.value.code == 128 + signal.SIGTERM
+    assert len(terminated) == 2
+    manifest = script.load_manifest(str(out_dir / ".job.json"))
+    statuses = [item["status"] for item in manifest["items"].values()]
+    assert statuses == ["pending", "pending"]
+
+
+def test_main_drops_losing_encode_before_mux(monkeypatch, tmp_path):
+    # the encode is larger than the one-byte source, so the original remux wins
+    out_dir, stage_dir = _stub_cq_encodes(monkeypatch, tmp_path, {"a.mp4": b"a"})
+    staged_at_mux = []
+
+    def fake_run(cmd, **kwargs):
+        if cmd[0] == "mkvmerge":
+            staged_at_mux.extend(p.name for p in stage_dir.rglob("*.mkv"))
+        return _fake_tool_run(cmd, **kwargs)
+
+    monkeypatch.setattr(script.subprocess, "run", fake_run)
+
+    script.main()
+
+    assert staged_at_mux == ["a.original.mkv"]
+    assert (out_dir / "a.mkv").read_bytes() == b"muxed"
+
+
+def test_main_drops_page_cache_of_published_output(monkeypatch, tmp_path):
+    out_dir, stage_dir = _stub_cq_encodes(monkeypatch, tmp_path, {"a.mp4": b"a" * 64})
+    dropped = []
+    monkeypatch.setattr(script, "_drop_page_cache", dropped.append)
+    monkeypatch.setattr(script.subprocess, "run", _fake_tool_run)
+
+    script.main()
+
+    assert str(out_dir / "a.mkv") in dropped
+    assert any(Path(path).parent == stage_dir for path in dropped)
+
+
+def test_main_drops_exit_hooks_when_interrupted(monkeypatch, tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "notes.txt").write_text("notes")
+    argv = [
+        "script.py",
+        "--input",
+        str(src_dir),
+        "--constant-quality",
+        "30",
+        "--output-dir",
+        str(tmp_path / "out"),
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    hooks = []
+    monkeypatch.setattr(
+        script,
+        "atexit",
+        types.SimpleNamespace(register=hooks.append, unregister=hooks.remove),
+    )
+
+    def interrupted_copy(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(script, "copy_assets", interrupted_copy)
+    previous = script.signal.getsignal(script.signal.SIGTERM)
+
+    with pytest.raises(KeyboardInterrupt):
+        script.main()
+
+    assert hooks == []
+    assert script.signal.getsignal(script.signal.SIGTERM) == previous
+
+
+def test_jobs_must_be_positive(monkeypatch, tmp_path):
+    argv = ["script.py", "--output-dir", str(tmp_path), "--jobs", "0"]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc:
+        script.main()
+    assert exc.value.code == 2
+
+
 def test_manifest_error_basenames():
     manifest = {
         "items": {
@@ -1110,14 +2309,58 @@ def test_src_key():
     assert script.src_key("/abs", st) == "/abs|123|456"
 
 
-def test_all_videos_done(monkeypatch):
+# smallest file _matroska_header_ok accepts: empty EBML header, then a Segment
+MKV_STUB = b"\x1a\x45\xdf\xa3\x80\x18\x53\x80\x67"
+
+
+def test_matroska_header_ok(tmp_path):
+    path = tmp_path / "a.mkv"
+    path.write_bytes(MKV_STUB + b"data")
+    assert script._matroska_header_ok(str(path))
+    # two-byte size varint covering a 2-byte header body
+    path.write_bytes(b"\x1a\x45\xdf\xa3\x40\x02\x42\x86\x18\x53\x80\x67")
+    assert script._matroska_header_ok(str(path))
+    for data in (b"", b"mkv", script._EBML_MAGIC, b"\x1a\x45\xdf\xa3\x81\x00xxxx"):
+        path.write_bytes(data)
+        assert not script._matroska_header_ok(str(path))
+    assert not script._matroska_header_ok(str(tmp_path / "missing.mkv"))
+
+
+def test_all_videos_done(monkeypatch, tmp_path):
+    (tmp_path / "a.mkv").write_bytes(MKV_STUB)
     manifest = {"items": {"1": {"type": "video", "output": "a.mkv", "status": "done"}}}
-    monkeypatch.setattr(script.os.path, "exists", lambda p: True)
     monkeypatch.setattr(script, "is_valid_media", lambda p: True)
-    assert script.all_videos_done(manifest, "/out") is True
+    assert script.all_videos_done(manifest, str(tmp_path)) is True
     manifest["items"]["1"]["status"] = "pending"
-    assert script.all_videos_done(manifest, "/out") is False
-    assert script.all_videos_done({"items": {}}, "/out") is False
+    assert script.all_videos_done(manifest, str(tmp_path)) is False
+    assert script.all_videos_done({"items": {}}, str(tmp_path)) is False
+    manifest["items"]["1"]["status"] = "done"
+    manifest["items"]["1"]["output"] = "missing.mkv"
+    assert script.all_videos_done(manifest, str(tmp_path)) is False
+
+
+def test_all_videos_done_trusts_validation_stamp(monkeypatch, tmp_path):
+    out = tmp_path / "a.mkv"
+    out.write_bytes(MKV_STUB)
+    rec = {
+        "type": "video",
+        "output": "a.mkv",
+        "status": "done",
+        "validated": script._output_stamp(out.stat()),
+    }
+    probed = []
+    monkeypatch.setattr(script, "is_valid_media", lambda p: probed.append(p))
+    assert script.all_videos_done({"items": {"1": rec}}, str(tmp_path)) is True
+    assert probed == []
+
+    out.write_bytes(MKV_STUB + b"changed")
+    assert script.all_videos_done({"items": {"1": rec}}, str(tmp_path)) is False
+    assert probed == [str(out)]
+
+    # a changed file without a Matroska header fails without an ffprobe
+    out.write_bytes(b"truncated")
+    assert script.all_videos_done({"items": {"1": rec}}, str(tmp_path)) is False
+    assert probed == [str(out)]
 
 
 def test_copy_if_fits(monkeypatch, tmp_path):
@@ -1139,7 +2382,7 @@ def test_copy_if_fits(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {"is_video": path.endswith(".mp4"), "duration": 10.0},
+        lambda path, **kwargs: {"is_video": path.endswith(".mp4"), "duration": 10.0},
     )
     monkeypatch.setattr(
         script,
@@ -1159,6 +2402,125 @@ def test_copy_if_fits(monkeypatch, tmp_path):
     assert rec["status"] == "done"
 
 
+def test_probe_workers_probe_uncached_inputs_concurrently(monkeypatch, tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    names = ["a.mp4", "b.mp4", "c.txt", "d.mp4"]
+    for name in names:
+        (src_dir / name).write_text(name)
+    out_dir = tmp_path / "out"
+    argv = [
+        "script.py",
+        "--input",
+        str(src_dir),
+        "--target-size",
+        "1M",
+        "--output-dir",
+        str(out_dir),
+        "--probe-workers",
+        "3",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    threads = set()
+
+    def fake_probe(path, **kwargs):
+        threads.add(threading.get_ident())
+        return {"is_video": path.endswith(".mp4"), "duration": 10.0}
+
+    monkeypatch.setattr(script, "probe_media_info", fake_probe)
+    script.main()
+
+    assert threading.get_ident() not in threads
+    manifest = json.loads((out_dir / ".job.json").read_text())
+    probed = {Path(e["path"]).name: e["is_video"] for e in manifest["probes"].values()}
+    assert probed == {name: name.endswith(".mp4") for name in names}
+    assert len(manifest["items"]) == 3
+
+
+def test_probe_results_saved_once_per_batch(monkeypatch, tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    for name in ("a.mp4", "b.mp4", "c.txt"):
+        (src_dir / name).write_text(name)
+    out_dir = tmp_path / "out"
+    argv = [
+        "script.py",
+        "--input",
+        str(src_dir),
+        "--target-size",
+        "1M",
+        "--output-dir",
+        str(out_dir),
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(
+        script,
+        "probe_media_info",
+        lambda path, **kwargs: {"is_video": path.endswith(".mp4"), "duration": 10.0},
+    )
+    snapshots = []
+    real_save = script.save_manifest
+
+    def counting_save(manifest, path):
+        snapshots.append(len(manifest["probes"]))
+        real_save(manifest, path)
+
+    monkeypatch.setattr(script, "save_manifest", counting_save)
+    script.main()
+
+    # one save for the probe batch, one for the copy fast path
+    assert snapshots == [3, 3]
+
+
+def test_probe_workers_must_be_positive(monkeypatch, tmp_path):
+    argv = ["script.py", "--output-dir", str(tmp_path), "--probe-workers", "0"]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc:
+        script.main()
+    assert exc.value.code == 2
+
+
+def test_ffprobe_threads_cap_probe_commands(monkeypatch, tmp_path):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "a.bin").write_text("a")
+    argv = [
+        "script.py",
+        "--input",
+        str(src_dir),
+        "--target-size",
+        "1M",
+        "--output-dir",
+        str(tmp_path / "out"),
+        "--probe-workers",
+        "4",
+        "--ffprobe-threads",
+        "2",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    cmds = []
+
+    def fake_ffprobe_json(cmd):
+        cmds.append(cmd)
+        return {"format": {}, "streams": []}
+
+    monkeypatch.setattr(script, "ffprobe_json", fake_ffprobe_json)
+    script.main()
+
+    assert cmds
+    for cmd in cmds:
+        i = cmd.index("-threads")
+        assert cmd[i + 1] == "2"
+
+
+def test_ffprobe_threads_must_be_positive(monkeypatch, tmp_path):
+    argv = ["script.py", "--output-dir", str(tmp_path), "--ffprobe-threads", "0"]
+    monkeypatch.setattr(sys, "argv", argv)
+    with pytest.raises(SystemExit) as exc:
+        script.main()
+    assert exc.value.code == 2
+
+
 def test_move_if_fits(monkeypatch, tmp_path):
     src_dir = tmp_path / "src"
     src_dir.mkdir()
@@ -1179,7 +2541,7 @@ def test_move_if_fits(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {"is_video": path.endswith(".mp4"), "duration": 10.0},
+        lambda path, **kwargs: {"is_video": path.endswith(".mp4"), "duration": 10.0},
     )
     script.main()
     assert not video.exists()
@@ -1214,7 +2576,7 @@ def test_constant_quality_groups_and_command(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {
+        lambda path, **kwargs: {
             "is_video": path.endswith(".mp4"),
             "duration": 60.0 if path.endswith(".mp4") else None,
         },
@@ -1410,7 +2772,7 @@ def test_constant_quality_ignores_fit_short_circuit(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {"is_video": path.endswith(".mp4"), "duration": 60.0},
+        lambda path, **kwargs: {"is_video": path.endswith(".mp4"), "duration": 60.0},
     )
     monkeypatch.setattr(script, "ffprobe_duration", lambda path: 60.0)
 
@@ -1518,7 +2880,7 @@ def test_mkvmerge_sets_creation_date_and_attachments(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {
+        lambda path, **kwargs: {
             "is_video": path.endswith(".mp4"),
             "duration": 60.0 if path.endswith(".mp4") else None,
         },
@@ -1653,6 +3015,88 @@ def test_mkvmerge_sets_creation_date_and_attachments(monkeypatch, tmp_path):
     assert mkv_cmd[attach_index - 1] == "Pre-re-encode metadata"
 
 
+def test_main_reuses_probed_creation_date(monkeypatch, tmp_path):
+    video = tmp_path / "a.mp4"
+    video.write_bytes(b"v" * 1024)
+    out_dir = tmp_path / "out"
+    stage_dir = tmp_path / "stage"
+
+    argv = [
+        "script.py",
+        "--input",
+        str(video),
+        "--output-dir",
+        str(out_dir),
+        "--stage-dir",
+        str(stage_dir),
+        "--constant-quality",
+        "32",
+    ]
+    monkeypatch.setattr(sys, "argv", argv)
+    monkeypatch.setattr(
+        script,
+        "probe_media_info",
+        lambda path, **kwargs: {
+            "is_video": True,
+            "duration": 60.0,
+            "creation_date": "2023-05-06T07:08:09Z",
+        },
+    )
+
+    def fail_creation_probe(path):
+        raise AssertionError("creation date should come from the probe cache")
+
+    monkeypatch.setattr(script, "get_container_creation_date", fail_creation_probe)
+
+    captured_mux_cmds: list[list[str]] = []
+
+    def fake_run(cmd, env=None, **kwargs):
+        if cmd[0] == "ffmpeg":
+            for idx, token in enumerate(cmd):
+                if token == "-f" and idx + 2 < len(cmd):
+                    output_path = Path(cmd[idx + 2])
+                    output_path.parent.mkdir(parents=True, exist_ok=True)
+                    output_path.write_bytes(b"encoded")
+        if cmd[0] == "mkvmerge":
+            captured_mux_cmds.append(cmd)
+            Path(cmd[cmd.index("-o") + 1]).write_bytes(b"remuxed")
+        return types.SimpleNamespace(returncode=0, stdout=b"{}", stderr=b"")
+
+    monkeypatch.setattr(script.subprocess, "run", fake_run)
+
+    def fake_dump(src, dest, verbose, **kwargs):
+        dest.mkdir(parents=True, exist_ok=True)
+        return {
+            "exports": [],
+            "attachments": [],
+            "metadata_path": None,
+            "container_tags": {},
+            "stream_infos": [
+                {
+                    "index": 0,
+                    "stream": {"codec_type": "video", "codec_name": "h264", "index": 0},
+                    "stype": "v",
+                    "mkv_ok": True,
+                    "spec": "v:0",
+                },
+            ],
+        }
+
+    monkeypatch.setattr(script, "_dump_streams_and_metadata", fake_dump)
+    monkeypatch.setattr(
+        script, "_pick_real_video_stream_index", lambda path: (0, "v:0")
+    )
+    monkeypatch.setattr(script, "is_valid_media", lambda path: True)
+
+    script.main()
+
+    manifest = json.loads((out_dir / script.MANIFEST_NAME).read_text())
+    (probe,) = manifest["probes"].values()
+    assert probe["creation_date"] == "2023-05-06T07:08:09Z"
+    mkv_cmd = captured_mux_cmds[0]
+    assert mkv_cmd[mkv_cmd.index("--date") + 1] == "2023-05-06T07:08:09Z"
+
+
 def test_dump_streams_data_sidecar_uses_container(monkeypatch, tmp_path):
     calls = []
 
@@ -1717,7 +3161,7 @@ def test_mov_with_data_stream_outputs_mkv(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {
+        lambda path, **kwargs: {
             "is_video": path.endswith(".mov"),
             "duration": 60.0 if path.endswith(".mov") else None,
         },
@@ -1882,7 +3326,7 @@ def test_low_bitrate_audio_stream_copied(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {"is_video": path.endswith(".mp4"), "duration": 10.0},
+        lambda path, **kwargs: {"is_video": path.endswith(".mp4"), "duration": 10.0},
     )
     monkeypatch.setattr(script, "ffprobe_duration", lambda path: 10.0)
 
@@ -2015,7 +3459,7 @@ def test_low_bitrate_video_stream_copied(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {"is_video": path.endswith(".mp4"), "duration": 10.0},
+        lambda path, **kwargs: {"is_video": path.endswith(".mp4"), "duration": 10.0},
     )
     monkeypatch.setattr(script, "ffprobe_duration", lambda path: 10.0)
 
@@ -2157,7 +3601,7 @@ def test_sidecar_files_are_renamed(monkeypatch, tmp_path):
     monkeypatch.setattr(
         script,
         "probe_media_info",
-        lambda path: {
+        lambda path, **kwargs: {
             "is_video": path.endswith(".mp4"),
             "duration": 60.0 if path.endswith(".mp4") else None,
         },